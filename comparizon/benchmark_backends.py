@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timedelta
+from simpleplots import Figure
+import random
+import time
+
+#-------------------------------------------------------------------------------
+
+def get_random_values(x, y):
+    xvalues = [i for i in range(x, y)]
+    yvalues = [i for i in range(x, y)]
+    random.shuffle(yvalues)
+    return xvalues, yvalues
+
+def get_random_dates(x, y):
+    start = datetime(2022, 4, 17)
+    xvalues = [start + timedelta(days=i) for i in range(y)]
+    yvalues = [i for i in range(len(xvalues))]
+    random.shuffle(yvalues)
+    return xvalues, yvalues
+
+def run(backend, supersample, points, axes, values_getter, figures):
+    start = time.perf_counter()
+
+    for i in range(figures):
+        fig = Figure(backend=backend, supersample=supersample)
+
+        for j in range(axes):
+            xvalues, yvalues = values_getter(1, points)
+            fig.plot(xvalues, yvalues, linewidth=5, label=f'line{j}')
+
+        fig.legend()
+        fig.to_array()
+        fig.close()
+
+    return (time.perf_counter() - start) / figures
+
+#-------------------------------------------------------------------------------
+
+workloads = [
+    ('200_points_1_axes', 200, 1, get_random_values),
+    ('200_points_2_axes', 200, 2, get_random_values),
+    ('2000_points_2_axes', 2000, 2, get_random_values),
+    ('20000_points_2_axes', 20000, 2, get_random_values),
+    ('200_points_1_axes_dates', 200, 1, get_random_dates),
+    ('200_points_2_axes_dates', 200, 2, get_random_dates),
+    ('2000_points_2_axes_dates', 2000, 2, get_random_dates),
+    ('20000_points_2_axes_dates', 20000, 2, get_random_dates),
+]
+
+if __name__ == '__main__':
+    figures = 5
+
+    modes = [('pil', True), ('numpy', True), ('pil', False), ('numpy', False)]
+
+    header = ''.join(f"{backend + ('' if supersample else ' native'):>14}"
+                     for backend, supersample in modes)
+    print(f"{'workload (s/fig)':<28}{header}")
+
+    for name, points, axes, values_getter in workloads:
+        timings = list()
+        for backend, supersample in modes:
+            random.seed(0)
+            timings.append(run(backend, supersample, points, axes,
+                               values_getter, figures))
+        print(f"{name:<28}" + ''.join(f"{t:>14.3f}" for t in timings))
+
+#-------------------------------------------------------------------------------
@@ -45,7 +45,7 @@ setuptools.setup(
     version=about['__version__'],
     description=about['__description__'],
     packages=['simpleplots'],
-    py_modules=['base', 'dates', 'figure', 'themes', 'ticker', 'utils', 'visuals'],
+    py_modules=['backends', 'base', 'cache', 'dates', 'downsample', 'figure', 'glyphs', 'markers', 'scales', 'themes', 'ticker', 'utils', 'visuals'],
     include_package_data=True,
     package_data={'': ['*.ttf'], 'simpleplots': ['fonts/*.*']},
     classifiers=classifiers,
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+
+"""
+simpleplots.backends
+~~~~~~~~~~~~~~~~~~~~
+
+This module contains drawing backends. The default 'pil' backend draws with
+Pillow's ImageDraw, while the 'numpy' backend rasterizes lines and markers
+straight into a NumPy RGB buffer and only uses Pillow for text. Both backends
+can draw anti-aliased lines and markers from 8-bit coverage masks.
+
+"""
+
+__all__ = ('AntialiasedImageDraw', 'ArrayImageDraw', 'BACKENDS', 'RASTER_CHUNK_SIZE',
+           'RASTER_BAND_SIZE', 'create_draw', 'rasterize_lines')
+
+from .base import Size
+from .visuals import CustomImageDraw
+from .markers import get_marker_sprite, stamp_sprite
+
+from PIL import Image, ImageColor, ImageDraw
+from contextlib import contextmanager
+from typing import Tuple, Union
+import numpy as np
+
+#-------------------------------------------------------------------------------
+
+RASTER_CHUNK_SIZE: int = 1 << 15
+
+# maximum number of pixels of the band of a line mask filled at once
+RASTER_BAND_SIZE: int = 1 << 18
+
+#-------------------------------------------------------------------------------
+
+def _to_rgb(fill: Union[str, Tuple[int, ...]]) -> Tuple[int, ...]:
+    """Converts color name or tuple to RGB tuple."""
+    if isinstance(fill, str):
+        fill = ImageColor.getrgb(fill)
+    return tuple(fill[:3])
+
+def _ramp(counts: np.ndarray, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For every group of the given sizes returns the group index of each element
+    and a range starting at the offset of the group, e.g. counts [2, 3] and
+    offsets [5, 0] give [0, 0, 1, 1, 1] and [5, 6, 0, 1, 2].
+
+    """
+
+    groups = np.repeat(np.arange(len(counts)), counts)
+    shift = offsets - (np.cumsum(counts) - counts)
+    return groups, np.arange(len(groups)) + shift[groups]
+
+def _blend(region: np.ndarray, coverage: np.ndarray, color: Tuple[int, ...]) -> None:
+    """Blends color into RGB region proportionally to 8-bit coverage."""
+    # fully covered pixels (most of a thick line) are just set to the color
+    region[coverage == 255] = color
+
+    cy, cx = np.nonzero((coverage != 0) & (coverage != 255))
+    alpha = coverage[cy, cx, None].astype(np.float32) / 255
+    background = region[cy, cx].astype(np.float32)
+    color = np.asarray(color, dtype=np.float32)
+    region[cy, cx] = np.rint(background + (color - background) * alpha)
+
+def _accumulate(target: np.ndarray, indices: np.ndarray,
+                subtract: bool = False) -> None:
+    """Adds (or subtracts) counts of the flat indices to the target array."""
+    if not len(indices):
+        return
+
+    lowest, highest = indices.min(), indices.max()
+    if highest - lowest > 8 * len(indices):
+        # sparse indices, avoid counting over the whole range between them
+        indices, counts = np.unique(indices, return_counts=True)
+    else:
+        counts = np.bincount(indices - lowest)
+        indices = slice(lowest, lowest + len(counts))
+
+    if subtract:
+        target[indices] -= counts
+    else:
+        target[indices] += counts
+
+def _fill_segments(p0: np.ndarray, p1: np.ndarray, width: float,
+                   out: np.ndarray, antialias: bool = False) -> None:
+    """
+    Fills segments whose first coordinate is the major one into the boolean
+    (major_size, minor_size) mask `out`. At every step along the major axis a
+    span across the line is computed. Only the two ends of every span are
+    written into a difference array, which is then integrated with a single
+    cumulative sum, so the cost does not depend on the line width.
+
+    The mask is filled in bands of rows along the major axis, so the
+    difference array only ever covers one band of at most `RASTER_BAND_SIZE`
+    pixels. Steps within a band are generated in chunks of at most
+    `RASTER_CHUNK_SIZE`, which bounds the memory used whatever the size of
+    the mask and the length of the line are.
+
+    If `antialias` is set, `out` is an 8-bit coverage mask instead: pixels
+    inside the span are fully covered, while the two pixels at its ends are
+    covered proportionally to their overlap with the span.
+
+    """
+
+    major_size, minor_size = out.shape
+
+    da = p1[:, 0] - p0[:, 0]
+    slope = np.divide(p1[:, 1] - p0[:, 1], da, out=np.zeros_like(da),
+                      where=da != 0)
+    half = max(width, 1) * np.sqrt(1 + slope ** 2) / 2
+
+    # the center of the line crosses step `a` at `a * slope + intercept`,
+    # pixel `m` spans [m, m + 1) in these coordinates
+    intercept = p0[:, 1] - p0[:, 0] * slope + 0.5
+    lower, upper = intercept - half, intercept + half
+
+    first = np.rint(np.minimum(p0[:, 0], p1[:, 0])).clip(0, major_size).astype(np.int64)
+    last = np.rint(np.maximum(p0[:, 0], p1[:, 0])).clip(-1, major_size - 1).astype(np.int64)
+
+    row = minor_size + 1
+    rows = max(RASTER_BAND_SIZE // row, 1)
+
+    for band in range(0, major_size, rows):
+        band_rows = min(rows, major_size - band)
+
+        band_first = np.maximum(first, band)
+        counts = np.minimum(last, band + band_rows - 1) - band_first + 1
+        segments = np.flatnonzero(counts > 0)
+        if not len(segments):
+            continue
+
+        diff = np.zeros(band_rows * row, dtype=np.int32)
+        if antialias:
+            partial = np.zeros(band_rows * minor_size, dtype=np.uint8)
+
+        counts, band_first = counts[segments], band_first[segments]
+        ends = np.cumsum(counts)
+        i = 0
+        while i < len(counts):
+            limit = ends[i] - counts[i] + RASTER_CHUNK_SIZE
+            j = max(int(np.searchsorted(ends, limit, side='right')), i + 1)
+
+            chunk, a = _ramp(counts[i:j], band_first[i:j])
+            chunk = segments[chunk + i]
+            a -= band
+            i = j
+
+            shift = (a + band) * slope[chunk]
+            span_lower = shift + lower[chunk]
+            span_upper = shift + upper[chunk]
+
+            if antialias:
+                edge_lower, edge_upper = np.floor(span_lower), np.floor(span_upper)
+                start = edge_lower.astype(np.int64) + 1
+                end = np.maximum(edge_upper.astype(np.int64), start)
+
+                # partially covered pixels at both ends of the spans
+                edges = np.concatenate([edge_lower, edge_upper]).astype(np.int64)
+                weights = np.concatenate([
+                    np.minimum(span_upper, edge_lower + 1) - span_lower,
+                    np.where(edge_upper > edge_lower, span_upper - edge_upper, 0)
+                ]).astype(np.float32)
+                weights = np.rint(np.minimum(weights, 1) * 255).astype(np.uint8)
+                # overlapping spans keep the strongest coverage
+                inside = (edges >= 0) & (edges < minor_size)
+                indices = np.concatenate([a, a])[inside] * minor_size + edges[inside]
+                np.maximum.at(partial, indices, weights[inside])
+            else:
+                start = np.floor(span_lower).astype(np.int64)
+                end = np.maximum(np.floor(span_upper).astype(np.int64), start + 1)
+
+            np.clip(start, 0, minor_size, out=start)
+            np.clip(end, 0, minor_size, out=end)
+            a *= row
+            _accumulate(diff, a + start)
+            _accumulate(diff, a + end, subtract=True)
+
+        diff = diff.reshape(band_rows, row)
+        full = np.cumsum(diff, axis=1, dtype=np.int32, out=diff)[:, :-1] > 0
+        target = out[band:band + band_rows]
+
+        if antialias:
+            partial = partial.reshape(band_rows, minor_size)
+            partial[full] = 255
+            np.maximum(target, partial, out=target)
+        else:
+            np.logical_or(target, full, out=target)
+
+def rasterize_lines(xy: np.ndarray, width: float, size: Size,
+                    antialias: bool = False) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Rasterizes a polyline of the given width over an image of the given size.
+    Returns a boolean mask (or an 8-bit coverage mask if `antialias` is set)
+    of the area covered by the line, clipped to the image, and the coordinates
+    of its top left corner. Every segment is walked along its major axis, so
+    the amount of work is proportional to the length of the line rather than
+    its painted area.
+
+    """
+
+    points = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    if len(points) == 1:
+        points = np.concatenate([points, points])
+
+    # limit the mask to the bounding box of the line
+    reach = max(width, 1) + 1
+    x0, y0 = np.maximum(np.floor(points.min(axis=0) - reach), 0).astype(int)
+    x1, y1 = np.minimum(np.ceil(points.max(axis=0) + reach), size).astype(int)
+    img_width, img_height = max(x1 - x0, 0), max(y1 - y0, 0)
+    points = points - (x0, y0)
+
+    p0, p1 = points[:-1], points[1:]
+    xmajor = np.abs(p1[:, 0] - p0[:, 0]) >= np.abs(p1[:, 1] - p0[:, 1])
+    ymajor = ~xmajor
+
+    # x-major segments paint vertical spans, y-major ones horizontal spans
+    mask = np.zeros((img_height, img_width),
+                    dtype=np.uint8 if antialias else bool)
+    if np.any(xmajor):
+        _fill_segments(p0[xmajor], p1[xmajor], width, mask.T, antialias)
+    if np.any(ymajor):
+        _fill_segments(p0[ymajor, ::-1], p1[ymajor, ::-1], width, mask, antialias)
+    return mask, (int(x0), int(y0))
+
+#-------------------------------------------------------------------------------
+
+class AntialiasedImageDraw(CustomImageDraw):
+    antialias = True
+
+    def line(self, xy, fill=None, width: int = 0) -> None:
+        """Draws an anti-aliased polyline through the given coordinates."""
+        coverage, (x0, y0) = rasterize_lines(xy, width, self._image.size,
+                                             antialias=True)
+        if not coverage.size:
+            return
+
+        mask = Image.fromarray(coverage)
+        box = (x0, y0, x0 + mask.size[0], y0 + mask.size[1])
+        self._image.paste(_to_rgb(fill), box, mask)
+        mask.close()
+
+#-------------------------------------------------------------------------------
+
+class ArrayImageDraw(object):
+
+    def __init__(self, size: Size, color: Tuple[int, ...], mode: str = 'RGB',
+                 antialias: bool = False, background: Image.Image = None) -> None:
+        """
+        Initializes ArrayImageDraw instance, a drawing backend that keeps the
+        image as a NumPy RGB buffer. Lines and markers are rasterized with
+        vectorized NumPy operations, everything else is drawn by Pillow on a
+        copy of the affected region only.
+
+        """
+
+        if mode != 'RGB':
+            raise ValueError("'numpy' backend only supports RGB images")
+
+        self.antialias = antialias
+        self.size = tuple(size)
+
+        if background is not None:
+            self.buffer = np.array(background, dtype=np.uint8)
+        else:
+            color = _to_rgb(color)
+            shape = (self.size[1], self.size[0], 3)
+            if len(set(color)) == 1:
+                # gray backgrounds (e.g. white) are filled byte by byte
+                self.buffer = np.full(shape, color[0], dtype=np.uint8)
+            else:
+                self.buffer = np.empty(shape, dtype=np.uint8)
+                self.buffer[:] = color
+
+    @property
+    def image(self) -> Image.Image:
+        """Pillow image with the current content of the buffer."""
+        return Image.fromarray(self.buffer, 'RGB')
+
+    @contextmanager
+    def _region(self, box: Tuple[float, ...]):
+        """Yields Pillow draw over a region of the buffer and its offset."""
+        x0, y0 = max(int(box[0]), 0), max(int(box[1]), 0)
+        x1 = min(int(np.ceil(box[2])) + 1, self.size[0])
+        y1 = min(int(np.ceil(box[3])) + 1, self.size[1])
+        if x0 >= x1 or y0 >= y1:
+            yield CustomImageDraw(Image.new('RGB', (1, 1))), (x0, y0)
+            return
+
+        region = Image.fromarray(self.buffer[y0:y1, x0:x1], 'RGB')
+        draw = CustomImageDraw(region)
+        draw.antialias = self.antialias
+        yield draw, (x0, y0)
+        self.buffer[y0:y1, x0:x1] = np.asarray(region)
+        region.close()
+
+    def line(self, xy, fill=None, width: int = 0) -> None:
+        """Draws a polyline through the given coordinates."""
+        mask, (x0, y0) = rasterize_lines(xy, width, self.size, self.antialias)
+        region = self.buffer[y0:y0 + mask.shape[0], x0:x0 + mask.shape[1]]
+
+        if self.antialias:
+            _blend(region, mask, _to_rgb(fill))
+        else:
+            region[mask] = _to_rgb(fill)
+
+    def markers(self, xy: np.ndarray, marker: str, size: int, fill) -> None:
+        """Stamps the same marker at all (N, 2) point coordinates at once."""
+        if not len(xy):
+            return
+
+        sprite = get_marker_sprite(marker, size, fill, self.antialias)
+        coverage, (x0, y0) = stamp_sprite(np.asarray(xy), sprite)
+        self._blend_coverage(coverage, (x0, y0), sprite.color)
+
+    def bitmap(self, xy, bitmap: Image.Image, fill=None) -> None:
+        """Fills non-zero parts of the 8-bit mask placed at the given position."""
+        coverage = np.asarray(bitmap)
+        self._blend_coverage(coverage, (int(xy[0]), int(xy[1])), _to_rgb(fill))
+
+    def _blend_coverage(self, coverage: np.ndarray, offset: Tuple[int, int],
+                        color: Tuple[int, ...]) -> None:
+        """Blends color through coverage placed at the offset, clipped to the image."""
+        x0, y0 = offset
+        x1, y1 = x0 + coverage.shape[1], y0 + coverage.shape[0]
+        if x0 >= self.size[0] or y0 >= self.size[1] or x1 <= 0 or y1 <= 0:
+            return
+
+        coverage = coverage[max(-y0, 0):coverage.shape[0] - max(y1 - self.size[1], 0),
+                            max(-x0, 0):coverage.shape[1] - max(x1 - self.size[0], 0)]
+        _blend(self.buffer[max(y0, 0):y1, max(x0, 0):x1], coverage, color)
+
+    def text(self, xy, text: str, font, anchor: str = None, fill=None) -> None:
+        """Draws text through Pillow on the affected region."""
+        bbox = font.getbbox(text, anchor=anchor)
+        box = (xy[0] + bbox[0] - 1, xy[1] + bbox[1] - 1,
+               xy[0] + bbox[2] + 1, xy[1] + bbox[3] + 1)
+
+        with self._region(box) as (draw, (x0, y0)):
+            draw.text((xy[0] - x0, xy[1] - y0), text=text, font=font,
+                      anchor=anchor, fill=fill)
+
+    def rtext(self, xy, text: str, font, anchor: str = None, fill=None,
+              rotation: float = None) -> None:
+        """Draws rotated text through Pillow on the affected region."""
+        if not rotation:
+            return self.text(xy, text=text, font=font, anchor=anchor, fill=fill)
+
+        bbox = font.getbbox(text)
+        reach = bbox[2] + bbox[3]
+        box = (xy[0] - reach, xy[1] - reach, xy[0] + reach, xy[1] + reach)
+
+        with self._region(box) as (draw, (x0, y0)):
+            draw.rtext(xy=(xy[0] - x0, xy[1] - y0), text=text, font=font,
+                       anchor=anchor, fill=fill, rotation=rotation)
+
+    def multiline_textbbox(self, *args, **kwargs) -> Tuple[int, ...]:
+        """Returns bounding box of multiline text without drawing it."""
+        return ImageDraw.Draw(Image.new('1', (1, 1))).multiline_textbbox(*args, **kwargs)
+
+    def rounded_rectangle(self, xy, radius: float = 0, fill=None, outline=None,
+                          width: int = 1) -> None:
+        """Draws rounded rectangle through Pillow on the affected region."""
+        with self._region(xy) as (draw, (x0, y0)):
+            box = (xy[0] - x0, xy[1] - y0, xy[2] - x0, xy[3] - y0)
+            draw.rounded_rectangle(box, radius=radius, fill=fill,
+                                   outline=outline, width=width)
+
+#-------------------------------------------------------------------------------
+
+def _create_pil_draw(size: Size, color: Tuple[int, ...], mode: str = 'RGB',
+                     antialias: bool = False,
+                     background: Image.Image = None) -> CustomImageDraw:
+    draw_class = AntialiasedImageDraw if antialias else CustomImageDraw
+    if background is not None:
+        return draw_class(background.copy())
+    return draw_class(Image.new(mode, tuple(size), color=color))
+
+BACKENDS = {
+    'pil': _create_pil_draw,
+    'numpy': ArrayImageDraw,
+}
+
+def create_draw(backend: str, size: Size, color: Tuple[int, ...],
+                mode: str = 'RGB', antialias: bool = False,
+                background: Image.Image = None
+                ) -> Union[CustomImageDraw, ArrayImageDraw]:
+    """
+    Creates drawing object of the given backend over an empty image, or over
+    a copy of the `background` image if one is given. Lines and markers are
+    anti-aliased if `antialias` is set.
+
+    """
+
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend '{backend}', expected one of "
+                         f"{tuple(BACKENDS)}")
+    return BACKENDS[backend](size, color, mode, antialias, background)
+
+#-------------------------------------------------------------------------------
@@ -4,14 +4,14 @@
 simpleplots.base
 ~~~~~~~~~~~~~~~~
 
-This module contains all the dataclasses.
+This module contains all the dataclasses and the `Axes` series container.
 
 """
 
-__all__ = ('Coords', 'Theme', 'Axes', 'Point', 'Size')
+__all__ = ('Coords', 'Theme', 'Axes', 'Point', 'Size', 'Sprite', 'CacheInfo')
 
 from typing import Tuple, NamedTuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from numbers import Number
 import numpy as np
 
@@ -31,6 +31,17 @@ class Coords(NamedTuple):
     x1: Number
     y1: Number
 
+class Sprite(NamedTuple):
+    alpha: np.ndarray
+    color: Tuple[int, ...]
+    radius: int
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
 #-------------------------------------------------------------------------------
 
 @dataclass
@@ -64,20 +75,77 @@ class Theme:
 
 #-------------------------------------------------------------------------------
 
-@dataclass
-class Axes():
-    xvalues: np.ndarray
-    yvalues: np.ndarray
-    color: str
-    linewidth: int
-    linestyle: str
-    marker: str
-    markersize: int
-    label: str
-    points: np.ndarray = field(init=False)
-
-    def __post_init__(self):
-        values = np.asarray([self.xvalues, self.yvalues])
-        self.points = np.dstack(values)[0]
+class Axes(object):
+    __slots__ = ('xvalues', 'yvalues', 'color', 'linewidth', 'linestyle',
+                 'marker', 'markersize', 'label', 'downsample', 'max_points')
+
+    def __init__(self, xvalues: np.ndarray, yvalues: np.ndarray, color: str,
+                 linewidth: int, linestyle: str, marker: str, markersize: int,
+                 label: str, downsample: str = None, max_points: int = None,
+                 dtype: np.dtype = None) -> None:
+        """
+        Initializes Axes instance that owns one contiguous array of x values
+        and one of y values. Numeric values can be stored with a smaller dtype
+        (e.g. float32 or int32), dates are always kept as they are.
+
+        """
+
+        self.xvalues = self._as_values(xvalues, dtype)
+        self.yvalues = self._as_values(yvalues, dtype)
+
+        if self.xvalues.shape != self.yvalues.shape:
+            raise ValueError('xvalues and yvalues must have the same shape, got '
+                             f'{self.xvalues.shape} and {self.yvalues.shape}')
+
+        self.color = color
+        self.linewidth = linewidth
+        self.linestyle = linestyle
+        self.marker = marker
+        self.markersize = markersize
+        self.label = label
+        self.downsample = downsample
+        self.max_points = max_points
+
+    @staticmethod
+    def _as_values(values: np.ndarray, dtype: np.dtype = None) -> np.ndarray:
+        """
+        Returns contiguous values, numbers converted to the dtype. Values of
+        another kind (e.g. floats for an integer dtype) raise TypeError and
+        values out of the range of the dtype raise ValueError.
+
+        """
+
+        values = np.ascontiguousarray(values)
+        if dtype is None or values.dtype.kind not in 'iuf':
+            return values
+
+        dtype = np.dtype(dtype)
+        if not np.can_cast(values.dtype, dtype, casting='same_kind'):
+            raise TypeError(f'cannot store {values.dtype} values as {dtype}')
+
+        if not np.can_cast(values.dtype, dtype) and values.size:
+            info = np.iinfo(dtype) if dtype.kind in 'iu' else np.finfo(dtype)
+            finite = values[np.isfinite(values)] if values.dtype.kind == 'f' else values
+            if finite.size and (finite.min() < info.min or finite.max() > info.max):
+                raise ValueError(f'values out of the range of {dtype}')
+
+        return values.astype(dtype, copy=False)
+
+    @property
+    def points(self) -> np.ndarray:
+        """Pairs of x and y values, built on demand (objects for dates)."""
+        xvalues, yvalues = self.xvalues, self.yvalues
+        if xvalues.dtype.kind == 'M' or yvalues.dtype.kind == 'M':
+            xvalues, yvalues = xvalues.astype(object), yvalues.astype(object)
+        return np.column_stack((xvalues, yvalues))
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes taken by the values."""
+        return self.xvalues.nbytes + self.yvalues.nbytes
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(label={self.label!r}, size={self.xvalues.size}, '
+                f'dtype=({self.xvalues.dtype}, {self.yvalues.dtype}))')
 
 #-------------------------------------------------------------------------------
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+simpleplots.cache
+~~~~~~~~~~~~~~~~~
+
+This module contains a bounded cache with least recently used eviction, shared
+by everything that is worth keeping between figures of the same process.
+
+"""
+
+__all__ = ('LRUCache')
+
+from .base import CacheInfo
+
+from collections import OrderedDict
+from typing import Any, Hashable
+import threading
+
+#-------------------------------------------------------------------------------
+
+class LRUCache(object):
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """
+        Initializes LRUCache instance that keeps at most `maxsize` entries and
+        evicts the least recently used one when it is full. Lookups are
+        counted, so the efficiency of the cache can be checked:
+
+            cache = LRUCache(maxsize=2)
+            cache['a'] = 1
+            cache.get('a')
+            cache.info()  # CacheInfo(hits=1, misses=0, maxsize=2, currsize=1)
+
+        A cache with `maxsize` of 0 keeps nothing. The cache can be shared by
+        several threads.
+
+        """
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns cached value and marks it as the most recently used."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+                self._entries.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all the entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Returns hits, misses, maximum and current size of the cache."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+#-------------------------------------------------------------------------------
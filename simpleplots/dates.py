@@ -50,6 +50,21 @@ SEC_PER_WEEK = SEC_PER_DAY * DAYS_PER_WEEK
 
 MUSECONDS_PER_DAY = 1e6 * SEC_PER_DAY
 
+# datetime64 units of the frequencies of AutoDateLocator
+TICK_UNITS = ('Y', 'M', 'D', 'h', 'm', 's')
+
+# strftime formats np.datetime_as_string can produce: unit and whether only
+# the time part of the ISO string is kept
+ISO_FORMATS = {
+    '%Y': ('Y', False),
+    '%Y-%m': ('M', False),
+    '%Y-%m-%d': ('D', False),
+    '%Y-%m-%d %H:%M': ('m', False),
+    '%Y-%m-%d %H:%M:%S': ('s', False),
+    '%H:%M': ('m', True),
+    '%H:%M:%S': ('s', True)
+}
+
 MONDAY, TUESDAY, WEDNESDAY, THURSDAY, FRIDAY, SATURDAY, SUNDAY = (
     MO, TU, WE, TH, FR, SA, SU)
 WEEKDAYS = (MONDAY, TUESDAY, WEDNESDAY, THURSDAY, FRIDAY, SATURDAY, SUNDAY)
@@ -72,6 +87,12 @@ def _get_tzinfo(tz=None):
 
     raise TypeError("tz must be string or tzinfo subclass.")
 
+def _to_datetime(value):
+    """Converts datetime64 of any unit to datetime, dropping nanoseconds."""
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[us]').astype(datetime.datetime)
+    return value
+
 class rrulewrapper:
 
     def __init__(self, freq, tzinfo=None, **kwargs):
@@ -177,17 +198,47 @@ class DateFormatter(Formatter):
         self.rotation = rotation
 
     def __call__(self, value):
-        return value.astype(datetime.datetime).strftime(self.fmt)
+        return _to_datetime(value).strftime(self.fmt)
+
+    def _config_key(self):
+        return (type(self), self.fmt, self.tz)
+
+    def _format_ticks(self, values):
+        values = np.asarray(values, dtype='datetime64[us]')
+
+        # strftime doesn't pad years with zeros, ISO strings do
+        years = values.astype('datetime64[Y]').astype(np.int64) + 1970
+        if (self.fmt not in ISO_FORMATS or not len(values) or
+                years.min() < 1000 or years.max() > 9999):
+            return [self(value) for value in values]
+
+        unit, time_only = ISO_FORMATS[self.fmt]
+        labels = np.datetime_as_string(values, unit=unit)
+
+        if time_only:
+            return [label[11:] for label in labels.tolist()]
+        return np.char.replace(labels, 'T', ' ').tolist()
 
 class AutoDateFormatter(Formatter):
 
     def __init__(self, defaultfmt='%Y-%m-%d', rotation=45):
         self.defaultfmt = defaultfmt
         self.rotation = rotation
+        self._formatter = None
+
+    def _get_formatter(self):
+        if self._formatter is None or self._formatter.fmt != self.defaultfmt:
+            self._formatter = DateFormatter(self.defaultfmt, rotation=self.rotation)
+        return self._formatter
 
     def __call__(self, value):
-        formatter = DateFormatter(self.defaultfmt, rotation=self.rotation)
-        return formatter(value)
+        return self._get_formatter()(value)
+
+    def _config_key(self):
+        return (type(self), self.defaultfmt)
+
+    def _format_ticks(self, values):
+        return self._get_formatter()._format_ticks(values)
 
 #-------------------------------------------------------------------------------
 
@@ -206,8 +257,8 @@ class RRuleLocator(DateLocator):
         self.rule = o
 
     def tick_values(self, vmin, vmax):
-        vmin = vmin.astype(datetime.datetime)
-        vmax = vmax.astype(datetime.datetime)
+        vmin = _to_datetime(vmin)
+        vmax = _to_datetime(vmax)
         start, stop = self._create_rrule(vmin, vmax)
 
         dates = self.rule.between(start, stop, True)
@@ -369,11 +420,70 @@ class AutoDateLocator(DateLocator):
     def tick_values(self, vmin, vmax):
         if vmin == vmax:
             return [vmin]
+
+        if self.interval_multiples and vmin < vmax:
+            i, interval, byranges = self._choose_interval(vmin, vmax)
+            if i < len(TICK_UNITS):
+                return self._datetime64_ticks(vmin, vmax, i, interval, byranges)
+
         return self.get_locator(vmin, vmax).tick_values(vmin, vmax)
 
-    def get_locator(self, dmin, dmax):
-        dmin = dmin.astype(datetime.datetime)
-        dmax = dmax.astype(datetime.datetime)
+    def _datetime64_ticks(self, vmin, vmax, i, interval, byranges):
+        """
+        Generates the same ticks as the locator of `get_locator` would, but
+        directly as datetime64 values: every period of the chosen frequency
+        between the limits whose component is in its by-range (e.g. every 5th
+        minute), or every `interval` years for the yearly frequency.
+
+        """
+
+        dmin = np.datetime64(_to_datetime(vmin), 'us')
+        dmax = np.datetime64(_to_datetime(vmax), 'us')
+        lower = dmin
+
+        if i == 0:
+            year = dmin.astype('datetime64[Y]').astype(np.int64) + 1970
+            ymin = max(year // interval * interval, 1)
+            year = dmax.astype('datetime64[Y]').astype(np.int64) + 1970
+            ymax = min(-(-year // interval) * interval, 9999)
+
+            years = np.arange(ymin, ymax + 1, interval) - 1970
+            ticks = years.astype('datetime64[Y]').astype('datetime64[us]')
+
+            # YearLocator's range starts on the first year with the time of vmin
+            lower = ticks[0] + (dmin - dmin.astype('datetime64[s]'))
+            dmax = ticks[-1]
+
+        else:
+            unit = TICK_UNITS[i]
+            periods = np.arange(dmin.astype(f'datetime64[{unit}]'),
+                                dmax.astype(f'datetime64[{unit}]') + 1)
+            numbers = periods.astype(np.int64)
+
+            if unit == 'M':
+                components = numbers % 12 + 1
+            elif unit == 'D':
+                components = (periods - periods.astype('datetime64[M]')).astype(np.int64) + 1
+            else:
+                components = numbers % {'h': 24, 'm': 60, 's': 60}[unit]
+
+            ticks = periods[np.isin(components, list(byranges[i]))].astype('datetime64[us]')
+
+        ticks = ticks[(ticks >= lower) & (ticks <= dmax)]
+
+        if len(ticks) == 0:
+            return [_to_datetime(vmin), _to_datetime(vmax)]
+        return ticks.tolist()
+
+    def _choose_interval(self, dmin, dmax):
+        """
+        Chooses the frequency of ticks (as index of `self._freqs`), their
+        interval and by-ranges of every frequency.
+
+        """
+
+        dmin = _to_datetime(dmin)
+        dmax = _to_datetime(dmax)
         delta = relativedelta(dmax, dmin)
         tdelta = dmax - dmin
 
@@ -392,8 +502,6 @@ class AutoDateLocator(DateLocator):
         nums = [numYears, numMonths, numDays, numHours, numMinutes,
                 numSeconds, numMicroseconds]
 
-        use_rrule_locator = [True] * 6 + [False]
-
         byranges = [None, 1, 1, 0, 0, 0, None]
 
         for i, (freq, num) in enumerate(zip(self._freqs, nums)):
@@ -428,6 +536,15 @@ class AutoDateLocator(DateLocator):
         else:
             interval = 1
 
+        return i, interval, byranges
+
+    def get_locator(self, dmin, dmax):
+        i, interval, byranges = self._choose_interval(dmin, dmax)
+        freq = self._freqs[i]
+        dmin = _to_datetime(dmin)
+        dmax = _to_datetime(dmax)
+        use_rrule_locator = [True] * 6 + [False]
+
         if (freq == YEARLY) and self.interval_multiples:
             locator = YearLocator(interval, tz=self.tz)
         elif use_rrule_locator[i]:
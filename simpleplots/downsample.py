@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+simpleplots.downsample
+~~~~~~~~~~~~~~~~~~~~~~
+
+This module contains reduction of large series before drawing. Once a series
+has more points than there are pixel columns to draw them in, most of them
+are not visible on the image and can be dropped with little visual difference,
+either keeping the extremes of every column (M4) or a fixed number of points
+when markers are drawn as well (LTTB).
+
+"""
+
+__all__ = ('DOWNSAMPLING', 'M4_POINTS_PER_COLUMN', 'is_sorted', 'm4', 'lttb',
+           'lttb_indices')
+
+from numpy.typing import ArrayLike
+from typing import Tuple
+import numpy as np
+
+#-------------------------------------------------------------------------------
+
+DOWNSAMPLING: Tuple[str, ...] = ('auto', 'm4', 'lttb', None)
+
+M4_POINTS_PER_COLUMN: int = 4
+
+#-------------------------------------------------------------------------------
+
+def is_sorted(values: np.ndarray) -> bool:
+    """Whether values are sorted in non-decreasing order."""
+    return bool(np.all(values[1:] >= values[:-1]))
+
+def _first_in_groups(mask: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Returns index of the first True element of every group."""
+    indices = np.where(mask, np.arange(len(mask)), len(mask))
+    return np.minimum.reduceat(indices, starts)
+
+def m4(coords: np.ndarray) -> np.ndarray:
+    """
+    Reduces (N, 2) image coordinates of a polyline sorted by x to the first,
+    the lowest, the highest and the last point of every pixel column, in their
+    original order and position. The reduced line keeps the vertical extent of
+    every column and the connections between neighboring columns with at most
+    4 points per column, but segments within a column are merged, so the
+    drawn pixels are close to, not exactly the same as, those of the full line.
+
+    """
+
+    if len(coords) <= M4_POINTS_PER_COLUMN:
+        return coords
+
+    columns = np.rint(coords[:, 0])
+    starts = np.concatenate([[0], np.flatnonzero(columns[1:] != columns[:-1]) + 1])
+    ends = np.concatenate([starts[1:], [len(coords)]]) - 1
+
+    y = coords[:, 1]
+    groups = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    lowest = _first_in_groups(y == np.minimum.reduceat(y, starts)[groups], starts)
+    highest = _first_in_groups(y == np.maximum.reduceat(y, starts)[groups], starts)
+
+    keep = np.unique(np.concatenate([starts, lowest, highest, ends]))
+    return coords[keep]
+
+#-------------------------------------------------------------------------------
+
+def _to_float(values: np.ndarray) -> np.ndarray:
+    """Returns float offsets of numeric or datetime64 values from the first one."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.view(np.int64)
+    elif np.issubdtype(values.dtype, np.integer):
+        values = values.astype(np.int64)
+    return (values - values[0]).astype(np.float64)
+
+def lttb_indices(xvalues: ArrayLike, yvalues: ArrayLike, max_points: int) -> np.ndarray:
+    """
+    Returns indices of at most `max_points` points chosen by the Largest
+    Triangle Three Buckets algorithm from a series sorted by x. The first and
+    the last points are always kept, the rest are split into equal buckets,
+    and the point forming the largest triangle with the point chosen from the
+    previous bucket and the average of the next one is chosen from each.
+
+    Each choice depends on the previous one, so buckets are walked in order,
+    but all the points of a bucket are compared at once.
+
+    """
+
+    x, y = _to_float(xvalues), _to_float(yvalues)
+    length = len(x)
+
+    if max_points >= length or length <= 2:
+        return np.arange(length)
+    if max_points < 3:
+        return np.asarray([0, length - 1])[:max(max_points, 0)]
+
+    # bucket boundaries of all points except the first and the last one
+    edges = (np.arange(max_points - 1) * (length - 2) / (max_points - 2)).astype(np.int64) + 1
+    edges[-1] = length - 1
+    starts, sizes = edges[:-1], np.diff(edges)
+
+    # points of every bucket as rows padded with the last point of the row
+    width = sizes.max()
+    columns = np.minimum(np.arange(width), sizes[:, None] - 1)
+    indices = starts[:, None] + columns
+    bx, by = x[indices], y[indices]
+
+    # average of the next bucket, the last point for the last one
+    sums_x = np.add.reduceat(x[1:length - 1], starts - 1)
+    sums_y = np.add.reduceat(y[1:length - 1], starts - 1)
+    next_x = np.append(sums_x[1:] / sizes[1:], x[-1])
+    next_y = np.append(sums_y[1:] / sizes[1:], y[-1])
+
+    # doubled triangle area is linear in the candidate point:
+    # |cx * (ny - ay) + cy * (ax - nx) + (nx * ay - ax * ny)|
+    chosen = np.empty(max_points, dtype=np.int64)
+    chosen[0], chosen[-1] = 0, length - 1
+    ax, ay = x[0], y[0]
+
+    for i in range(len(starts)):
+        nx, ny = next_x[i], next_y[i]
+        areas = np.abs(bx[i] * (ny - ay) + by[i] * (ax - nx) + (nx * ay - ax * ny))
+        j = int(np.argmax(areas))
+        chosen[i + 1] = indices[i, j]
+        ax, ay = bx[i, j], by[i, j]
+
+    return chosen
+
+def lttb(xvalues: ArrayLike, yvalues: ArrayLike,
+         max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a series sorted by x to at most `max_points` points with the
+    Largest Triangle Three Buckets algorithm. Works on numeric and datetime64
+    values, which are returned in their original dtypes:
+
+        x, y = lttb(xvalues, yvalues, 1000)
+
+    """
+
+    xvalues, yvalues = np.asarray(xvalues), np.asarray(yvalues)
+    indices = lttb_indices(xvalues, yvalues, max_points)
+    return xvalues[indices], yvalues[indices]
+
+#-------------------------------------------------------------------------------
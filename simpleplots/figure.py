@@ -11,13 +11,20 @@ This module contains Figure instance.
 __all__ = ('Figure')
 
 from .base import Theme, Axes, Size
-from .utils import (get_indices_of_values_in_list, smartrange, normalize_values,
-                    get_font, choose_locator, choose_formatter, get_text_dimensions)
-from .visuals import Spines, PointsGrid, CustomImageDraw
+from .utils import (normalize_values, get_font, choose_locator, choose_formatter,
+                    choose_scale, get_text_dimensions, measure_many)
+from .visuals import Spines, PointsGrid
+from .backends import BACKENDS, create_draw
+from .markers import MARKERS
+from .glyphs import get_glyph_atlas
+from .downsample import (DOWNSAMPLING, M4_POINTS_PER_COLUMN, is_sorted, m4,
+                         lttb_indices)
 from .themes import StandardTheme
 from .ticker import Locator, Formatter
+from .cache import LRUCache
 
 from numpy.typing import ArrayLike
+from typing import List, Tuple
 
 from PIL import Image
 import numpy as np
@@ -25,9 +32,17 @@ import gc
 
 #-------------------------------------------------------------------------------
 
+# rasterized background, spines, grid, ticks and tick labels of recent figures
+# created with chrome_cache=True
+CHROME_CACHE = LRUCache(maxsize=4)
+
+#-------------------------------------------------------------------------------
+
 class Figure(object):
 
-    def __init__(self, size: Size = (1600, 1200), theme: Theme = StandardTheme):
+    def __init__(self, size: Size = (1600, 1200), theme: Theme = StandardTheme,
+                 backend: str = 'pil', supersample: bool = True,
+                 glyph_atlas: bool = False, chrome_cache: bool = False):
         """
         Initializes the Figure instance responsible for all the operations
         on visualizing plots:
@@ -48,16 +63,56 @@ class Figure(object):
             ...
             fig.close()
 
+        Lines and markers are drawn with Pillow by default. The opt-in 'numpy'
+        backend rasterizes them straight into a NumPy buffer instead (see
+        comparizon/benchmark_backends.py for how the two compare):
+
+            fig = Figure(backend='numpy')
+
+        By default the figure is drawn twice as large and scaled down on
+        output. With `supersample=False` it is drawn at the requested size with
+        anti-aliased lines and markers instead, which takes 4 times less memory
+        and skips the final resize:
+
+            fig = Figure(supersample=False)
+
+        Tick labels made only of digits, '.', '-', ':' and spaces can be
+        composed out of glyphs rasterized once per font instead of being
+        rendered by FreeType one by one (other labels are drawn as usual):
+
+            fig = Figure(glyph_atlas=True)
+
+        Figures that are drawn over and over with the same size, theme and
+        ticks (e.g. live charts) can share their rasterized background, spines,
+        grid and tick labels. The last 4 of them are kept in memory, at the
+        drawing size of the figure:
+
+            fig = Figure(chrome_cache=True)
+
         """
 
-        self.width = size[0] * 2
-        self.height = size[1] * 2
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend '{backend}', expected one of "
+                             f"{tuple(BACKENDS)}")
+
+        self.supersample = supersample
+        self.pixel_ratio = 2 if supersample else 1
+
+        self.width = size[0] * self.pixel_ratio
+        self.height = size[1] * self.pixel_ratio
         self.theme = theme
+        self.backend = backend
+        self.glyph_atlas = glyph_atlas
+        self.chrome_cache = chrome_cache
 
         self.img = None
         self.draw = None
         self.axes = list()
 
+        self._title = None
+        self._legend = None
+        self._stale = True
+
         self.spines = Spines(self.width, self.height, self.theme)
         self.grid = PointsGrid(self.spines, self.theme)
 
@@ -67,14 +122,33 @@ class Figure(object):
         self.x_formatter = None
         self.y_formatter = None
 
-    def _create_empty_image(self, _mode: str = 'RGB') -> None:
-        """Creates an empty image and initializes CustomImageDraw."""
+    def _create_empty_image(self, _mode: str = 'RGB',
+                            background: Image.Image = None) -> None:
+        """
+        Creates an empty image (or a copy of the background image) and
+        initializes backend's drawing object.
+
+        """
+
         if self.img:
             self.img.close()
+            self.img = None
+
+        self.draw = create_draw(self.backend, (self.width, self.height),
+                                self.theme.figure_background_color, _mode,
+                                antialias=not self.supersample,
+                                background=background)
 
-        self.img = Image.new(_mode, (self.width, self.height),
-                             color=self.theme.figure_background_color)
-        self.draw = CustomImageDraw(self.img)
+    def _px(self, length: float) -> float:
+        """
+        Converts length given in pixels of the supersampled image (theme's
+        widths, linewidth, markersize) to pixels of the figure's image.
+
+        """
+
+        if self.supersample:
+            return length
+        return length / 2
 
     def _draw_spines(self) -> None:
         """Draws graph spines."""
@@ -82,7 +156,7 @@ class Figure(object):
             self.draw.line(
                 xy=spine,
                 fill=self.theme.spine_color,
-                width=self.theme.spine_width
+                width=self._px(self.theme.spine_width)
             )
 
     def _configure_locators(self) -> None:
@@ -105,177 +179,307 @@ class Figure(object):
 
     def _configure_grid_settings(self) -> None:
         """
-        Fills gaps in input values range, finds major ticks and saves all the
-        information to PointsGrid.
+        Finds major ticks and saves the scales of both axes to PointsGrid.
 
         Say, the input values are [1, 3, 4], but drawing only these 3 values in
         a row would ruin the scale because by doing so, we unintentionally show
         that the distance between 1 and 3 is the same as the distance between
         3 and 4, which is, of course, false.
 
-        To avoid this, we firstly fill the gaps by converting the [1, 3, 4] to
-        [1, 2, 3, 4]. Now, the grid contains all the values to correctly
-        visualize the scale.
-
-        At the same time, if the values are, for example, [1, 4, 46, 98] - the
-        list with filled gaps would contain almost 100 elements and labeling
-        all of them would be a mess. That's why we find "major ticks", in this
-        case: [0, 10, 20, 30, ..., 100]. These are the only values that will be
-        labeled along spines, although we still keep track of all 100 to display
-        the actual plot.
+        To avoid this, values are placed proportionally to their position
+        between the limits of the scale, so 3 ends up twice as far from 1 as
+        4 from 3. The limits cover both the values and the "major ticks", in
+        case of [1, 4, 46, 98] these are [0, 10, 20, 30, ..., 100]. Only major
+        ticks are labeled along spines and only they are stored with the scale,
+        whatever the resolution of the values is.
 
         """
 
         xvalues = np.concatenate([axes.xvalues for axes in self.axes])
         x_major_ticks = self.x_locator.tick_values(np.min(xvalues), np.max(xvalues))
-        xvmin, xvmax = np.min(x_major_ticks), np.max(x_major_ticks)
-
-        self.grid.xvalues = smartrange(xvmin, xvmax, xvalues)
-        self.grid.cell_width = self.grid.width / max(len(self.grid.xvalues) - 1, 1)
-        self.grid.x_major_ticks = get_indices_of_values_in_list(x_major_ticks,
-                                                                self.grid.xvalues)
+        self.grid.x_scale = choose_scale(xvalues, x_major_ticks)
 
         #-----------------------------------------------------------------------
 
         yvalues = np.concatenate([axes.yvalues for axes in self.axes])
         y_major_ticks = self.y_locator.tick_values(np.min(yvalues), np.max(yvalues))
-        yvmin, yvmax = np.min(y_major_ticks), np.max(y_major_ticks)
-
-        self.grid.yvalues = smartrange(yvmin, yvmax, yvalues)
-        self.grid.cell_height = self.grid.height / max(len(self.grid.yvalues) - 1, 1)
-        self.grid.y_major_ticks = get_indices_of_values_in_list(y_major_ticks,
-                                                                self.grid.yvalues)
+        self.grid.y_scale = choose_scale(yvalues, y_major_ticks)
 
     def _draw_grid(self) -> None:
         """Draws grid lines within spines box."""
-        for x_index in self.grid.x_major_ticks:
-            line_coords = self.grid.get_x_line_coords(x_index)
+        for x in self.grid.x_major_ticks:
+            line_coords = self.grid.get_x_line_coords(x)
 
             self.draw.line(
                 xy=line_coords,
                 fill=self.theme.grid_line_color,
-                width=self.theme.grid_line_width
+                width=self._px(self.theme.grid_line_width)
             )
 
-        for y_index in self.grid.y_major_ticks:
-            line_coords = self.grid.get_y_line_coords(y_index)
+        for y in self.grid.y_major_ticks:
+            line_coords = self.grid.get_y_line_coords(y)
 
             self.draw.line(
                 xy=line_coords,
                 fill=self.theme.grid_line_color,
-                width=self.theme.grid_line_width
+                width=self._px(self.theme.grid_line_width)
             )
 
     def _draw_major_ticks(self) -> None:
         """Draws ticks along spines box."""
-        for x_index in self.grid.x_major_ticks:
-            tick_coords = self.grid.get_x_tick_coords(x_index)
+        for x in self.grid.x_major_ticks:
+            tick_coords = self.grid.get_x_tick_coords(x)
 
             self.draw.line(
                 xy=tick_coords,
                 fill=self.theme.tick_line_color,
-                width=self.theme.tick_line_width
+                width=self._px(self.theme.tick_line_width)
             )
 
-        for y_index in self.grid.y_major_ticks:
-            tick_coords = self.grid.get_y_tick_coords(y_index)
+        for y in self.grid.y_major_ticks:
+            tick_coords = self.grid.get_y_tick_coords(y)
 
             self.draw.line(
                 xy=tick_coords,
                 fill=self.theme.tick_line_color,
-                width=self.theme.tick_line_width
+                width=self._px(self.theme.tick_line_width)
             )
 
-    def _draw_tick_labels(self) -> None:
+    def _get_tick_labels(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Returns labels of major ticks of both axes."""
+        x_labels = tuple(self.x_formatter.format_ticks(self.grid.x_scale.major_ticks))
+        y_labels = tuple(self.y_formatter.format_ticks(self.grid.y_scale.major_ticks))
+        return x_labels, y_labels
+
+    def _draw_tick_labels(self, x_labels: Tuple[str, ...],
+                          y_labels: Tuple[str, ...]) -> None:
         """Draws major ticks labels."""
         tick_font = get_font('tick_label', self.theme, self.width)
 
-        for x_index in self.grid.x_major_ticks:
-            label = self.x_formatter(self.grid.xvalues[x_index])
-            if not label:
-                continue
-
-            coords = self.grid.get_x_tick_label_coords(x_index, label, tick_font)
-
-            self.draw.rtext(xy=coords, text=label, font=tick_font,
-                            anchor="mm", fill=self.theme.tick_label_color,
-                            rotation=self.x_formatter.rotation)
-
-        for y_index in self.grid.y_major_ticks:
-            label = self.y_formatter(self.grid.yvalues[y_index])
-            if not label:
-                continue
-
-            coords = self.grid.get_y_tick_label_coords(y_index, label, tick_font)
-
-            self.draw.rtext(xy=coords, text=label, font=tick_font,
-                            anchor="mm", fill=self.theme.tick_label_color,
-                            rotation=self.y_formatter.rotation)
-
-    def _draw_axes(self, axes: Axes) -> None:
-        """Draw axes points and connection lines."""
-        points = self.grid.get_axes_points_coords(axes)
-
-        for point in points:
-            if axes.marker == 'o':
-                self.draw.ellipse(
-                    (
-                        point[0] - axes.markersize,
-                        point[1] - axes.markersize,
-                        point[0] + axes.markersize,
-                        point[1] + axes.markersize
-                    ),
-                    fill=axes.color
-                )
-
-        points = [tuple(p) for p in points]
+        x_ticks = [(label, x) for label, x in zip(x_labels, self.grid.x_major_ticks) if label]
+        x_sizes = measure_many([label for label, _ in x_ticks], tick_font)
+
+        for (label, x), size in zip(x_ticks, x_sizes):
+            coords = self.grid.get_x_tick_label_coords(x, label, tick_font, size)
+            self._draw_tick_label(coords, label, tick_font, self.x_formatter.rotation)
+
+        y_ticks = [(label, y) for label, y in zip(y_labels, self.grid.y_major_ticks) if label]
+        y_sizes = measure_many([label for label, _ in y_ticks], tick_font)
+
+        for (label, y), size in zip(y_ticks, y_sizes):
+            coords = self.grid.get_y_tick_label_coords(y, label, tick_font, size)
+            self._draw_tick_label(coords, label, tick_font, self.y_formatter.rotation)
+
+    def _draw_tick_label(self, coords: Tuple[float, float], label: str,
+                         font, rotation: float) -> None:
+        """Draws one tick label, out of the glyph atlas when it is possible."""
+        if self.glyph_atlas:
+            atlas = get_glyph_atlas(font)
+
+            if atlas.supports(label):
+                atlas.draw(self.draw, coords, label,
+                           fill=self.theme.tick_label_color, rotation=rotation)
+                return
+
+        self.draw.rtext(xy=coords, text=label, font=font, anchor="mm",
+                        fill=self.theme.tick_label_color, rotation=rotation)
+
+    def _draw_axes(self, axes: Axes) -> np.ndarray:
+        """
+        Draw axes points and connection lines. Returns image coordinates of
+        all the points of the axes, which the legend is placed by.
+
+        """
+
+        coords = points = self.grid.get_axes_points_coords(axes)
+
+        if axes.downsample == 'lttb':
+            points = self._reduce_points(points, axes.max_points)
+
+        if axes.marker in MARKERS:
+            self.draw.markers(points, marker=axes.marker,
+                              size=self._px(axes.markersize), fill=axes.color)
+
         if axes.linestyle == 'solid':
-            self.draw.line(points, width=axes.linewidth, fill=axes.color)
+            self.draw.line(self._reduce_line(points, axes.downsample),
+                           width=self._px(axes.linewidth), fill=axes.color)
+
+        return coords
+
+    def _reduce_points(self, points: np.ndarray, max_points: int = None) -> np.ndarray:
+        """
+        Reduces x-sorted points with LTTB, by default to one point per pixel
+        column of the grid. Triangle areas only scale under the mapping of
+        values to the image, so image coordinates are reduced directly.
+
+        """
+
+        if max_points is None:
+            max_points = int(self.grid.width)
+
+        return points[lttb_indices(points[:, 0], points[:, 1], max_points)]
+
+    def _reduce_line(self, points: np.ndarray, downsample: str) -> np.ndarray:
+        """
+        Reduces x-sorted line points to at most 4 per pixel column (M4). With
+        'auto' downsampling only series sorted by x that have more points than
+        that are reduced.
+
+        """
+
+        if downsample == 'm4':
+            return m4(points)
+
+        if downsample == 'auto':
+            if len(points) > M4_POINTS_PER_COLUMN * self.grid.width and \
+               is_sorted(points[:, 0]):
+                return m4(points)
+
+        return points
 
     def set_major_locator(self, locator: Locator, axis: str) -> None:
         if axis == 'x':
             self.x_locator = locator
         elif axis == 'y':
             self.y_locator = locator
+        self._stale = True
 
     def set_major_formatter(self, formatter: Formatter, axis: str) -> None:
         if axis == 'x':
             self.x_formatter = formatter
         elif axis == 'y':
             self.y_formatter = formatter
+        self._stale = True
 
     def plot(self, xvalues: ArrayLike, yvalues: ArrayLike, color: str = 'red',
              linewidth: int = 4, linestyle: str = 'solid', marker: str = 'o',
-             markersize: int = 4, label: str = 'line') -> None:
+             markersize: int = 4, label: str = 'line',
+             downsample: str = None, max_points: int = None,
+             dtype: np.dtype = None, copy: bool = False,
+             xunit: str = None) -> None:
         """
         Plot y versus x as lines and/or markers on the image. Can be called
         multiple times from the same figure to include several properly scaled
-        plots within one figure.
+        plots within one figure. Nothing is drawn at this point, the image is
+        rendered once by `save`, `show` or `to_array`.
+
+        Every segment is drawn by default. With downsample='m4' lines of series
+        sorted by x are reduced to the first, the lowest, the highest and the
+        last point of every pixel column before drawing, which keeps the shape
+        of the line but not exactly the same pixels. With downsample='auto'
+        only series that have more than 4 points per pixel column are reduced.
+
+        With downsample='lttb' both the line and the markers are drawn through
+        at most `max_points` points (one per pixel column by default) chosen by
+        the Largest Triangle Three Buckets algorithm:
+
+            fig.plot(xvalues, yvalues, downsample='lttb', max_points=2000)
+
+        Numeric values can be kept with a smaller dtype to halve the memory
+        of long series (dates are not affected):
+
+            fig.plot(xvalues, yvalues, dtype=np.float32)
+
+        NumPy arrays, memoryviews and `array.array` are not copied unless their
+        values have to be rounded, so they must not be changed until the image
+        is rendered. Pass copy=True to let the figure keep its own copy.
+
+        Integer x values are plotted as dates since the epoch if `xunit` is
+        one of 's', 'ms', 'us' or 'ns' (the array is viewed, not converted):
+
+            fig.plot(timestamps_ms, yvalues, xunit='ms')
 
         """
 
-        self._create_empty_image()
-        self._draw_spines()
+        if downsample not in DOWNSAMPLING:
+            raise ValueError(f"unknown downsampling '{downsample}', expected "
+                             f"one of {DOWNSAMPLING}")
+
+        xvalues = normalize_values(xvalues, copy=copy, unit=xunit)
+        yvalues = normalize_values(yvalues, copy=copy)
 
-        xvalues = normalize_values(xvalues)
-        yvalues = normalize_values(yvalues)
+        if downsample in ('m4', 'lttb') and not is_sorted(xvalues):
+            raise ValueError(f"'{downsample}' downsampling requires values sorted by x")
 
         axes = Axes(xvalues, yvalues, color, linewidth, linestyle, marker,
-                    markersize, label)
+                    markersize, label, downsample, max_points, dtype)
         self.axes.append(axes)
+        self._stale = True
 
-        self._configure_locators()
-        self._configure_formatters()
-        self._configure_grid_settings()
+    def _render(self) -> None:
+        """
+        Rasterizes everything recorded by `plot`, `title` and `legend`. The
+        image is only drawn once, when it is actually requested, and reused
+        until the figure changes again. Locators, formatters and scales of the
+        axes are configured here as well, so all the series are only combined
+        once and locators or formatters set after `plot` are taken into account.
+
+        """
+
+        if self.img and not self._stale:
+            return
+
+        labels = None
+        if self.axes:
+            self._configure_locators()
+            self._configure_formatters()
+            self._configure_grid_settings()
+            labels = self._get_tick_labels()
+
+        background = None
+        if self.chrome_cache:
+            key = self._get_chrome_key(labels)
+            background = CHROME_CACHE.get(key)
+
+        self._create_empty_image(background=background)
 
-        if self.theme.grid_visibility:
-            self._draw_grid()
+        if background is None:
+            self._draw_chrome(labels)
+            if self.chrome_cache:
+                CHROME_CACHE[key] = self.draw.image.copy()
 
-        self._draw_major_ticks()
-        self._draw_tick_labels()
+        points = [self._draw_axes(axes) for axes in self.axes]
 
-        for axes in self.axes:
-            self._draw_axes(axes)
+        if self._title is not None:
+            self._draw_title(self._title)
+
+        if self._legend is not None:
+            self._draw_legend(points=points, **self._legend)
+
+        self.img = self.draw.image
+        self._stale = False
+
+    def _get_chrome_key(self, labels: Tuple[Tuple[str, ...], ...] = None) -> tuple:
+        """
+        Returns everything the static part of the image depends on: size,
+        theme, way of drawing, positions and labels of major ticks. Figures
+        with the same key share one rasterized chrome layer.
+
+        """
+
+        key = (self.width, self.height, self.theme, self.backend,
+               self.supersample, self.glyph_atlas)
+        if labels is None:
+            return key
+
+        return key + (
+            tuple(self.grid.x_major_ticks.tolist()),
+            tuple(self.grid.y_major_ticks.tolist()),
+            labels,
+            self.x_formatter.rotation,
+            self.y_formatter.rotation
+        )
+
+    def _draw_chrome(self, labels: Tuple[Tuple[str, ...], ...] = None) -> None:
+        """Draws spines, grid, major ticks and their labels."""
+        self._draw_spines()
+
+        if labels is not None:
+            if self.theme.grid_visibility:
+                self._draw_grid()
+
+            self._draw_major_ticks()
+            self._draw_tick_labels(*labels)
 
     def show(self) -> None:
         """
@@ -287,20 +491,47 @@ class Figure(object):
 
         """
 
+        self._render()
         self.img.show()
 
+    def _get_output_image(self, resample: int) -> Image.Image:
+        """
+        Renders the figure and scales it down to the requested size. Figures
+        drawn without supersampling are returned as they are.
+
+        """
+
+        self._render()
+        if not self.supersample:
+            return self.img
+
+        origin_size = (self.width // 2, self.height // 2)
+        return self.img.resize(size=origin_size, resample=resample)
+
     def save(self, path: str, autoclose: bool = True, resample: int = Image.BILINEAR):
         """Saves the figure as an image by the given path."""
-        origin_size = (self.width // 2, self.height // 2)
-        self.img = self.img.resize(size=origin_size, resample=resample)
-        self.img.save(path, compress_level=1)
+        img = self._get_output_image(resample)
+        img.save(path, compress_level=1)
+        if img is not self.img:
+            img.close()
 
         if autoclose:
             self.close()
 
+    def to_array(self, resample: int = Image.BILINEAR) -> np.ndarray:
+        """Returns the rendered figure as an RGB array of shape (H, W, 3)."""
+        img = self._get_output_image(resample)
+        array = np.asarray(img)
+        if img is not self.img:
+            img.close()
+        return array
+
     def close(self) -> None:
         """Explicitly closes the image."""
-        self.img.close()
+        if self.img:
+            self.img.close()
+            self.img = None
+            self.draw = None
         gc.collect()
 
     def title(self, text: str) -> None:
@@ -310,15 +541,32 @@ class Figure(object):
 
         """
 
+        self._title = text
+        self._stale = True
+
+    def legend(self, spacing: int = 4) -> None:
+        """
+        Adds a legend with the labels of all plotted axes. The legend is placed
+        in the section of the grid that is the least covered with points.
+
+        """
+
+        self._legend = {'spacing': spacing}
+        self._stale = True
+
+    def _draw_title(self, text: str) -> None:
+        """Draws the title on top of spines box."""
         title_font = get_font('title', self.theme, self.width)
         coords = self.grid.get_title_coords(text, title_font)
 
         self.draw.text(xy=coords, text=text, font=title_font, anchor="mm",
                        fill=self.theme.title_color)
 
-    def legend(self, spacing: int = 4) -> None:
+    def _draw_legend(self, spacing: int, points: List[np.ndarray] = None) -> None:
+        """Draws the legend box with a line sample and a label for each axes."""
         legend_font = get_font('legend', self.theme, self.width)
-        section = self.grid.get_legend_bbox(self.axes, legend_font)
+        spacing = self._px(spacing)
+        section = self.grid.get_legend_bbox(self.axes, legend_font, points)
 
         labels = '\n'.join(['bbbb' + ax.label for ax in self.axes])
         bbox = self.draw.multiline_textbbox(
@@ -338,10 +586,10 @@ class Figure(object):
 
         self.draw.rounded_rectangle(
             xy=new_bbox,
-            radius=15,
+            radius=self._px(15),
             fill=self.theme.figure_background_color,
             outline=self.theme.grid_line_color,
-            width=self.theme.grid_line_width
+            width=max(round(self._px(self.theme.grid_line_width)), 1)
         )
 
         for i, axes in enumerate(self.axes):
@@ -351,7 +599,8 @@ class Figure(object):
                 bbox[0] + letter_size[0] * 3,
                 bbox[1] + letter_size[1] / 1.5 + letter_size[1] * i + spacing * i
             )
-            self.draw.line(line_coords, width=axes.linewidth, fill=axes.color)
+            self.draw.line(line_coords, width=self._px(axes.linewidth),
+                           fill=axes.color)
 
             text_coords = (
                 bbox[0] + letter_size[0] * 4,
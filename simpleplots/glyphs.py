@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""
+simpleplots.glyphs
+~~~~~~~~~~~~~~~~~~
+
+This module contains glyph atlases. Tick labels are made of a tiny alphabet,
+so each of its characters is rasterized only once per font and whole labels
+are composed out of these glyphs with NumPy, without calling FreeType.
+
+"""
+
+__all__ = ('ATLAS_ALPHABET', 'ATLAS_CACHE', 'GlyphAtlas', 'get_glyph_atlas')
+
+from .cache import LRUCache
+from .utils import get_text_dimensions
+from .visuals import LABEL_CACHE
+
+from PIL import Image, ImageDraw, ImageFont
+from typing import Tuple
+import numpy as np
+import math
+
+#-------------------------------------------------------------------------------
+
+ATLAS_ALPHABET: str = '0123456789.-: '
+
+# glyph atlases keyed by (font path, font size)
+ATLAS_CACHE = LRUCache(maxsize=16)
+
+#-------------------------------------------------------------------------------
+
+class GlyphAtlas(object):
+
+    def __init__(self, font: ImageFont.FreeTypeFont,
+                 alphabet: str = ATLAS_ALPHABET) -> None:
+        """
+        Initializes GlyphAtlas instance that keeps an 8-bit mask and advance
+        width of every character of the alphabet. All the masks have the full
+        height of the font (from ascender to descender), so glyphs only need
+        to be shifted horizontally to compose a label.
+
+        """
+
+        self.font = font
+        ascent, descent = font.getmetrics()
+        self.height = ascent + descent
+        self.glyphs = dict()
+        self.advances = dict()
+
+        for char in alphabet:
+            advance = font.getlength(char)
+            width = max(math.ceil(max(advance, font.getbbox(char)[2])), 1)
+
+            mask = Image.new('L', (width, self.height), 0)
+            ImageDraw.Draw(mask).text((0, 0), char, font=font, fill=255)
+            self.glyphs[char] = np.asarray(mask)
+            self.advances[char] = advance
+            mask.close()
+
+    def supports(self, text: str) -> bool:
+        """Whether all the characters of the text are in the atlas."""
+        return all(char in self.glyphs for char in text)
+
+    def compose(self, text: str) -> Tuple[np.ndarray, float]:
+        """
+        Composes an 8-bit mask of the text out of the glyphs and returns it
+        together with the advance width of the whole text.
+
+        """
+
+        advances = np.asarray([self.advances[char] for char in text])
+        positions = np.rint(np.cumsum(advances) - advances).astype(int)
+        widths = [self.glyphs[char].shape[1] for char in text]
+        width = max(max(positions + widths, default=0), 1)
+
+        mask = np.zeros((self.height, width), dtype=np.uint8)
+        for char, x, glyph_width in zip(text, positions, widths):
+            region = mask[:, x:x + glyph_width]
+            np.maximum(region, self.glyphs[char], out=region)
+
+        return mask, float(advances.sum())
+
+    def draw(self, draw: ImageDraw.ImageDraw, xy: Tuple[float, float], text: str,
+             fill: Tuple[int, ...], rotation: float = None) -> None:
+        """
+        Draws the text centered at the given coordinates (like anchor 'mm'),
+        or rotated and placed the same way as `CustomImageDraw.rtext` does.
+        Rotated masks are composed once and then taken from `LABEL_CACHE`.
+
+        """
+
+        if rotation:
+            bitmap = self._get_rotated(text, rotation, getattr(draw, 'antialias', False))
+            x = int(xy[0]) - bitmap.size[0] + int(bitmap.size[0] * 0.1)
+            y = int(xy[1]) - int(bitmap.size[1] * 0.1)
+            draw.bitmap((x, y), bitmap, fill=fill)
+
+        else:
+            mask, advance = self.compose(text)
+            bitmap = Image.fromarray(mask)
+            # rounded the way Pillow places text with anchor 'mm' (the vertical
+            # axis of FreeType points up, so halves are rounded the other way)
+            x = math.floor(xy[0] + 0.5) - math.ceil(advance / 2)
+            y = math.ceil(xy[1] - 0.5) - self.height // 2
+            draw.bitmap((x, y), bitmap, fill=fill)
+            bitmap.close()
+
+    def _get_rotated(self, text: str, rotation: float,
+                     antialias: bool = False) -> Image.Image:
+        """
+        Returns rotated 8-bit mask of the text, cached without fill. Masks of
+        anti-aliased drawings are rotated with bicubic resampling.
+
+        """
+
+        key = (text, getattr(self.font, 'path', id(self.font)), self.font.size,
+               None, rotation, antialias)
+        rotated = LABEL_CACHE.get(key)
+
+        if rotated is None:
+            mask, _ = self.compose(text)
+
+            # same canvas as the one rotated text is rendered on
+            width, height = get_text_dimensions(text, self.font)
+            canvas = np.zeros((height, width), dtype=np.uint8)
+            height, width = min(height, mask.shape[0]), min(width, mask.shape[1])
+            canvas[:height, :width] = mask[:height, :width]
+
+            bitmap = Image.fromarray(canvas)
+            resample = Image.BICUBIC if antialias else Image.NEAREST
+            rotated = bitmap.rotate(rotation, expand=True, resample=resample)
+            bitmap.close()
+            LABEL_CACHE[key] = rotated
+
+        return rotated
+
+#-------------------------------------------------------------------------------
+
+def get_glyph_atlas(font: ImageFont.FreeTypeFont) -> GlyphAtlas:
+    """Returns glyph atlas of the font, atlases are kept in `ATLAS_CACHE`."""
+    key = (getattr(font, 'path', id(font)), font.size)
+    atlas = ATLAS_CACHE.get(key)
+
+    if atlas is None:
+        atlas = GlyphAtlas(font)
+        ATLAS_CACHE[key] = atlas
+
+    return atlas
+
+#-------------------------------------------------------------------------------
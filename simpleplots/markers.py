@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+"""
+simpleplots.markers
+~~~~~~~~~~~~~~~~~~~
+
+This module contains point markers. Each marker is rasterized only once per
+shape, size and color into an alpha sprite, which is then stamped at all the
+point positions at once and composited onto the image through a single mask.
+Anti-aliased sprites are drawn at a higher resolution and then reduced.
+
+"""
+
+__all__ = ('MARKERS', 'SPRITE_SUPERSAMPLING', 'STAMP_CHUNK_SIZE', 'get_marker_sprite',
+           'stamp_sprite')
+
+from .base import Sprite
+
+from PIL import Image, ImageDraw, ImageColor
+from typing import Tuple, Union
+import numpy as np
+import functools
+
+#-------------------------------------------------------------------------------
+
+MARKERS: Tuple[str, ...] = ('o', 's', '^', 'x')
+
+SPRITE_SUPERSAMPLING: int = 4
+
+# maximum number of stamped pixels indexed at once
+STAMP_CHUNK_SIZE: int = 1 << 18
+
+#-------------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=64)
+def get_marker_sprite(marker: str, size: int, fill: Union[str, Tuple[int, ...]],
+                      antialias: bool = False) -> Sprite:
+    """
+    Rasterizes marker of the given shape, size (radius) and color. Sprites are
+    cached, so each combination is only drawn once per process.
+
+    If `antialias` is set, the marker is drawn `SPRITE_SUPERSAMPLING` times
+    larger and reduced by averaging, so the edges get partial coverage.
+
+    """
+
+    if marker not in MARKERS:
+        raise ValueError(f"unknown marker '{marker}', expected one of {MARKERS}")
+
+    radius = max(int(round(size)), 0)
+    factor = SPRITE_SUPERSAMPLING if antialias else 1
+    side = (radius * 2 + 1) * factor
+    center = side / 2 - 0.5
+
+    mask = Image.new('L', (side, side), 0)
+    draw = ImageDraw.Draw(mask)
+
+    if marker == 'o':
+        draw.ellipse((0, 0, side - 1, side - 1), fill=255)
+    elif marker == 's':
+        draw.rectangle((0, 0, side - 1, side - 1), fill=255)
+    elif marker == '^':
+        draw.polygon([(center, 0), (0, side - 1), (side - 1, side - 1)], fill=255)
+    elif marker == 'x':
+        width = max(radius // 2, 1) * factor
+        draw.line((0, 0, side - 1, side - 1), fill=255, width=width)
+        draw.line((0, side - 1, side - 1, 0), fill=255, width=width)
+
+    if factor > 1:
+        reduced = mask.reduce(factor)
+        mask.close()
+        mask = reduced
+
+    alpha = np.asarray(mask, dtype=np.float32) / 255
+    mask.close()
+
+    if isinstance(fill, str):
+        fill = ImageColor.getrgb(fill)
+
+    return Sprite(alpha, tuple(fill[:3]), radius)
+
+#-------------------------------------------------------------------------------
+
+def stamp_sprite(points: np.ndarray, sprite: Sprite) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Stamps the sprite at all the given (N, 2) point coordinates in a few
+    vectorized passes. Returns an 8-bit coverage mask of the stamped area and
+    the coordinates of its top left corner. Points falling onto the same
+    pixel are stamped once. Points are stamped in chunks, so that at most
+    `STAMP_CHUNK_SIZE` pixel indices exist at any time.
+
+    """
+
+    points = np.rint(points).astype(np.int64)
+    x0, y0 = points.min(axis=0) - sprite.radius
+    x1, y1 = points.max(axis=0) + sprite.radius + 1
+    width = x1 - x0
+
+    # collapse duplicates
+    flat = np.unique((points[:, 1] - sprite.radius - y0) * width +
+                     (points[:, 0] - sprite.radius - x0))
+
+    sy, sx = np.nonzero(sprite.alpha)
+    offsets = sy * width + sx
+    alpha = np.rint(sprite.alpha[sy, sx] * 255).astype(np.uint8)
+    opaque = np.all(alpha == 255)
+
+    coverage = np.zeros((y1 - y0) * width, dtype=np.uint8)
+    chunk = max(STAMP_CHUNK_SIZE // max(len(offsets), 1), 1)
+
+    for start in range(0, len(flat), chunk):
+        indices = (flat[start:start + chunk, None] + offsets[None, :]).ravel()
+        if opaque:
+            coverage[indices] = 255
+        else:
+            # overlapping stamps of the same sprite keep the strongest coverage
+            np.maximum.at(coverage, indices, np.tile(alpha, len(indices) // len(offsets)))
+
+    return coverage.reshape(y1 - y0, width), (int(x0), int(y0))
+
+#-------------------------------------------------------------------------------
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+simpleplots.scales
+~~~~~~~~~~~~~~~~~~
+
+This module contains continuous axis scales. A scale only keeps the limits of
+the axis and its major ticks, values are mapped onto the image proportionally
+to their position between the limits.
+
+"""
+
+__all__ = ('Scale', 'LinearScale', 'DateScale')
+
+from numpy.typing import ArrayLike
+import numpy as np
+
+#-------------------------------------------------------------------------------
+
+class Scale(object):
+    vmin = None
+    vmax = None
+    major_ticks = None
+
+    @property
+    def single(self) -> bool:
+        """Whether the scale collapses into a single value."""
+        return self.vmin == self.vmax
+
+    def to_numeric(self, values: ArrayLike) -> np.ndarray:
+        """Returns values in a form suitable for affine transformation."""
+        return np.asarray(values)
+
+class LinearScale(Scale):
+
+    def __init__(self, values: np.ndarray, major_ticks: ArrayLike) -> None:
+        """
+        Initializes LinearScale instance that covers both the input values and
+        their major ticks. Unlike a gap-filled list of values, the memory used
+        by the scale does not depend on the resolution of the values.
+
+        Major ticks of integer values are kept as integers if all of them are
+        whole numbers, so they are labeled without a fractional part. Ticks
+        and limits are kept as int64 or float64 whatever the dtype of the
+        values is, so they can't overflow a narrower one.
+
+        """
+
+        major_ticks = np.asarray(major_ticks, dtype=np.float64)
+        integer = np.issubdtype(values.dtype, np.integer)
+
+        if integer and np.all(np.mod(major_ticks, 1) == 0):
+            major_ticks = major_ticks.astype(np.int64)
+
+        numeric = np.int64 if integer else np.float64
+
+        self.major_ticks = major_ticks
+        self.vmin = min(np.min(major_ticks), numeric(np.min(values)))
+        self.vmax = max(np.max(major_ticks), numeric(np.max(values)))
+
+    def to_numeric(self, values: ArrayLike) -> np.ndarray:
+        """Returns values as int64 or float64, wide enough for the limits."""
+        values = np.asarray(values)
+        if np.issubdtype(values.dtype, np.integer):
+            return values.astype(np.int64, copy=False)
+        return values.astype(np.float64, copy=False)
+
+class DateScale(Scale):
+
+    def __init__(self, values: np.ndarray, major_ticks: ArrayLike) -> None:
+        """
+        Initializes DateScale instance that covers both the input dates and
+        their major ticks. Dates are mapped as int64 offsets from the epoch in
+        the unit of the input values (e.g. seconds for `datetime64[s]`,
+        nanoseconds for `datetime64[ns]`), so no intermediate dates are ever
+        generated between the limits.
+
+        """
+
+        self.dtype = values.dtype
+
+        major_ticks = np.asarray(major_ticks, dtype=self.dtype)
+
+        self.major_ticks = major_ticks
+        self.vmin = min(np.min(major_ticks), np.min(values))
+        self.vmax = max(np.max(major_ticks), np.max(values))
+
+    def to_numeric(self, values: ArrayLike) -> np.ndarray:
+        """Returns int64 epoch offsets of the dates in the unit of the scale."""
+        values = np.asarray(values)
+        if values.dtype != self.dtype:
+            values = values.astype(self.dtype)
+        return values.view(np.int64)
+
+#-------------------------------------------------------------------------------
@@ -13,19 +13,29 @@ matplotlib's original code!
 
 """
 
-__all__ = ('Locator', 'AutoLocator', 'NullFormatter', 'AutoFormatter')
+__all__ = ('TICK_CACHE', 'TICK_LABEL_CACHE', 'Locator', 'AutoLocator',
+           'Formatter', 'NullFormatter', 'AutoFormatter')
 
-from decimal import *
+from .cache import LRUCache
+
+from typing import List
 import numpy as np
 import math
 
-getcontext().prec = 6
+# tick values keyed by locator configuration and (vmin, vmax)
+TICK_CACHE = LRUCache(maxsize=256)
+
+# tick labels keyed by formatter configuration, dtype and tick value
+TICK_LABEL_CACHE = LRUCache(maxsize=4096)
 
 #-------------------------------------------------------------------------------
 
-def normalize_float(n: float) -> float:
-    """Normalize floats like '1.230000000003' to just '1.23'."""
-    return float(Decimal(n).normalize())
+def step_decimals(step: float) -> int:
+    """Number of decimals needed to write the step (e.g. 2 for 0.25)."""
+    decimals = max(-math.floor(math.log10(step)), 0)
+    while decimals < 15 and abs(round(step, decimals) - step) > step * 1e-9:
+        decimals += 1
+    return decimals
 
 def scale_range(vmin: float, vmax: float, n: int = 1, threshold: int = 100):
     """Identifies the maximum scale of the given range."""
@@ -79,17 +89,64 @@ class Formatter(object):
         """Return the label for the given tick value."""
         raise NotImplementedError('Derived must override')
 
+    def _config_key(self):
+        """
+        Return everything the labels depend on. Labels are only cached for
+        formatters whose own class defines it, so subclasses with settings
+        of their own are never given labels of another configuration.
+
+        """
+
+        return (type(self),)
+
+    def format_ticks(self, values) -> List[str]:
+        """
+        Return the labels for all the given tick values at once. Labels are
+        kept in `TICK_LABEL_CACHE`, only the missing ones are formatted.
+
+        """
+
+        values = np.asarray(values)
+        if '_config_key' not in vars(type(self)):
+            return list(self._format_ticks(values))
+
+        config = (self._config_key(), values.dtype.str)
+        keys = (values.view(np.int64) if values.dtype.kind == 'M' else values).tolist()
+
+        labels = [TICK_LABEL_CACHE.get((config, key)) for key in keys]
+        missing = [i for i, label in enumerate(labels) if label is None]
+
+        if missing:
+            formatted = self._format_ticks(values[missing])
+            for i, label in zip(missing, formatted):
+                labels[i] = label
+                TICK_LABEL_CACHE[(config, keys[i])] = label
+
+        return labels
+
+    def _format_ticks(self, values: np.ndarray) -> List[str]:
+        return [self(value) for value in values]
+
 class NullFormatter(Formatter):
 
     def __call__(self, value):
         """Always return the empty string."""
         return ''
 
+    def _config_key(self):
+        return (type(self),)
+
 class AutoFormatter(Formatter):
 
     def __call__(self, value):
         return str(value)
 
+    def _config_key(self):
+        return (type(self),)
+
+    def _format_ticks(self, values: np.ndarray) -> List[str]:
+        return values.astype(str).tolist()
+
 #-------------------------------------------------------------------------------
 
 class Locator(object):
@@ -137,6 +194,7 @@ class AutoLocator(Locator):
             steps = steps[igood]
 
         istep = np.nonzero(steps >= raw_step)[0][0]
+        edge = EdgeInteger(steps[istep], offset)
 
         for istep in reversed(range(istep + 1)):
             step = steps[istep]
@@ -146,26 +204,44 @@ class AutoLocator(Locator):
                 step = max(1, step)
             best_vmin = (_vmin // step) * step
 
-            edge = EdgeInteger(step, offset)
+            edge.step = step
             low = edge.le(_vmin - best_vmin)
             high = edge.ge(_vmax - best_vmin)
 
+            decimals = step_decimals(float(step))
             ticks = np.arange(low, high + 1) * step + best_vmin
-            ticks = np.asarray([normalize_float(i) for i in ticks])
+            ticks = np.round(ticks, decimals) + 0.0
             nticks = ((ticks <= _vmax) & (ticks >= _vmin)).sum()
 
             if nticks >= self._min_n_ticks:
                 break
 
-        return ticks + offset
+        if offset:
+            return np.round(ticks + offset, decimals) + 0.0
+        return ticks
+
+    def _config_key(self):
+        return (type(self), self._nbins, tuple(self._steps.tolist()),
+                self._integer, self._min_n_ticks)
 
     def tick_values(self, vmin, vmax):
         if vmax < vmin:
             vmin, vmax = vmax, vmin
-        elif vmin == vmax:
+
+        # ticks are calculated in Python floats, so narrow integers cannot
+        # overflow, but large int64 limits may round to the same float and
+        # the cache is keyed by the exact values
+        _vmin, _vmax = float(vmin), float(vmax)
+        if _vmin == _vmax:
             return [vmin]
 
-        locs = self._raw_ticks(vmin, vmax)
-        return locs
+        key = (self._config_key(), np.asarray(vmin).item(), np.asarray(vmax).item())
+        locs = TICK_CACHE.get(key)
+
+        if locs is None:
+            locs = self._raw_ticks(_vmin, _vmax)
+            TICK_CACHE[key] = locs
+
+        return locs.copy()
 
 #-------------------------------------------------------------------------------
@@ -8,22 +8,27 @@ This module contains simpleplots' utilities.
 
 """
 
-__all__ = ('get_font', 'get_text_dimensions', 'normalize_float', 'find_gcd',
-           'decimals', 'isint', 'normalize_values', 'frange', 'smartrange'
-           'get_indices_of_values_in_list', 'choose_locator')
+__all__ = ('FONT_CACHE', 'TEXT_METRICS_CACHE', 'load_font', 'get_font',
+           'get_text_dimensions', 'measure_many', 'normalize_float',
+           'normalize_floats', 'find_gcd', 'decimals', 'isint',
+           'to_datetime64', 'normalize_values', 'farange', 'frange', 'smartrange',
+           'get_indices_of_values_in_list', 'choose_locator', 'choose_formatter',
+           'choose_scale')
 
 from .base import Theme, Size
 from .ticker import Locator, AutoLocator, AutoFormatter
 from .dates import AutoDateLocator, AutoDateFormatter
+from .scales import Scale, LinearScale, DateScale
+from .cache import LRUCache
 
-from typing import List, Iterable
+from typing import List, Iterable, Tuple
 from numpy.typing import ArrayLike
 from numbers import Number
 from PIL import ImageFont
 
 from dateutil.relativedelta import relativedelta
 from datetime import datetime, timedelta
-from functools import reduce
+from functools import lru_cache
 from decimal import *
 import numpy as np
 import math
@@ -33,44 +38,85 @@ getcontext().prec = 6
 
 #-------------------------------------------------------------------------------
 
-DISPLAYABLE: int = 15360 # maximum number of elements per axis
 INT_DTYPES: List[str] = ['int8', 'int16', 'int32', 'int64']
 FLOAT_DTYPES: List[str] = ['float16', 'float32', 'float64', 'float96', 'float128']
 DATE_DTYPE: str = 'datetime64'
+SUBSECOND_UNITS: List[str] = ['ms', 'us', 'ns']
+EPOCH_UNITS: List[str] = ['s', 'ms', 'us', 'ns']
+EPOCH_ORDINAL: int = datetime(1970, 1, 1).toordinal()
+
+FONTS_FOLDER: str = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'fonts')
+
+# loaded fonts keyed by (path, size)
+FONT_CACHE = LRUCache(maxsize=32)
+
+# text dimensions keyed by (font path, font size, text)
+TEXT_METRICS_CACHE = LRUCache(maxsize=4096)
 
 #-------------------------------------------------------------------------------
 
+@lru_cache(maxsize=None)
+def _resolve_font_path(font: str) -> str:
+    """Returns path of a bundled font, other paths are returned as they are."""
+    path = os.path.join(FONTS_FOLDER, font)
+    return path if os.path.isfile(path) else font
+
+def load_font(font: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Returns font of the given pixel size by its bundled name (e.g. 'arial.ttf')
+    or path. Loading a font reads the file and creates a FreeType face, so the
+    loaded fonts are kept in `FONT_CACHE` and shared by all the figures.
+
+    """
+
+    key = (_resolve_font_path(font), int(size))
+    loaded = FONT_CACHE.get(key)
+
+    if loaded is None:
+        loaded = ImageFont.truetype(*key)
+        FONT_CACHE[key] = loaded
+
+    return loaded
+
 def get_font(type_: str, theme: Theme, image_width: int) -> ImageFont:
     """Return ImageFont based theme, type and image width."""
-    package_directory_path = os.path.abspath(os.path.dirname(__file__))
-    fonts_folder = os.path.join(package_directory_path, 'fonts')
-
     if type_ == 'tick_label':
-        return ImageFont.truetype(
-            os.path.join(fonts_folder, theme.tick_label_font),
-            int(image_width * theme.tick_label_size_perc)
-        )
+        return load_font(theme.tick_label_font,
+                         image_width * theme.tick_label_size_perc)
 
     elif type_ == 'title':
-        return ImageFont.truetype(
-            os.path.join(fonts_folder, theme.title_font),
-            int(image_width * theme.title_size_perc)
-        )
+        return load_font(theme.title_font, image_width * theme.title_size_perc)
 
     elif type_ == 'legend':
-        return ImageFont.truetype(
-            os.path.join(fonts_folder, theme.legend_font),
-            int(image_width * theme.legend_size_perc)
-        )
+        return load_font(theme.legend_font, image_width * theme.legend_size_perc)
 
 def get_text_dimensions(text_string: str, font: ImageFont) -> Size:
-    """Calculates size of a given text string using given font."""
-    ascent, descent = font.getmetrics()
+    """
+    Calculates size of a given text string using given font. The text is only
+    rendered once per font, the result is kept in `TEXT_METRICS_CACHE`.
+
+    """
+
+    key = (getattr(font, 'path', id(font)), font.size, text_string)
+    dimensions = TEXT_METRICS_CACHE.get(key)
+
+    if dimensions is None:
+        ascent, descent = font.getmetrics()
+        bbox = font.getmask(text_string).getbbox()
+        dimensions = (bbox[2], bbox[3] + descent)
+        TEXT_METRICS_CACHE[key] = dimensions
+
+    return dimensions
 
-    text_width = font.getmask(text_string).getbbox()[2]
-    text_height = font.getmask(text_string).getbbox()[3] + descent
+def measure_many(texts: Iterable[str], font: ImageFont) -> List[Size]:
+    """
+    Calculates sizes of all the given text strings (e.g. a full set of tick
+    labels) using given font. Repeated strings are only measured once.
 
-    return (text_width, text_height)
+    """
+
+    measured = {text: get_text_dimensions(text, font) for text in set(texts)}
+    return [measured[text] for text in texts]
 
 #-------------------------------------------------------------------------------
 
@@ -78,9 +124,78 @@ def normalize_float(n: float) -> float:
     """Normalize floats like '1.230000000003' to just '1.23'."""
     return float(Decimal(n).normalize())
 
-def find_gcd(lst: List[int]) -> int:
-    """Find GCD of a list."""
-    return reduce(math.gcd, lst)
+def _round_significant(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rounds finite non-zero floats to `getcontext().prec` significant digits
+    (half to even, like `Decimal.normalize`). Returns the rounded digits as
+    integers, decimal scales of the values and a mask of the values which
+    are too close to a tie (or too large or small) to be rounded reliably
+    in float arithmetic.
+
+    """
+
+    digits = getcontext().prec
+    exponents = np.floor(np.log10(np.abs(values))).astype(np.int64)
+    scales = digits - 1 - exponents
+
+    # powers of ten up to 1e22 are exact, so scaling is correctly rounded
+    powers = 10.0 ** np.minimum(np.abs(scales), 22)
+    with np.errstate(over='ignore', invalid='ignore'):
+        scaled = np.where(scales >= 0, values * powers, values / powers)
+        fractions = np.abs(scaled - np.trunc(scaled))
+
+    magnitudes = np.abs(scaled)
+    margin = 10.0 ** digits * 2.0 ** -50
+    unreliable = ((np.abs(scales) > 22) |
+                  (magnitudes < 10 ** (digits - 1)) | (magnitudes >= 10 ** digits) |
+                  (np.abs(fractions - 0.5) < margin))
+
+    rounded = np.where(unreliable, 0, np.rint(scaled)).astype(np.int64)
+    return rounded, scales, unreliable
+
+def normalize_floats(values: ArrayLike, copy: bool = True) -> np.ndarray:
+    """
+    Vectorized `normalize_float`, gives exactly the same values. Only the
+    values float arithmetic can't round reliably go through `Decimal`. With
+    copy=False a float64 array that needs no rounding is returned as it is.
+
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+
+    indices = np.flatnonzero(np.isfinite(values) & (values != 0))
+    rounded, scales, unreliable = _round_significant(values[indices])
+
+    powers = 10.0 ** np.minimum(np.abs(scales), 22)
+    normalized = np.where(scales >= 0, rounded / powers, rounded * powers)
+
+    for i in np.flatnonzero(unreliable):
+        normalized[i] = normalize_float(float(values[indices[i]]))
+
+    changed = normalized != values[indices]
+    if not copy and not changed.any():
+        return values
+
+    values = values.copy()
+    values[indices[changed]] = normalized[changed]
+    return values
+
+def find_gcd(lst: ArrayLike, chunksize: int = 8192) -> int:
+    """
+    Find GCD of a list. Values are reduced with `np.gcd` chunk by chunk and
+    the reduction stops as soon as the GCD is 1.
+
+    """
+
+    values = np.asarray(lst, dtype=np.int64)
+    gcd = 0
+
+    for start in range(0, len(values), chunksize):
+        gcd = np.gcd(gcd, np.gcd.reduce(values[start:start + chunksize]))
+        if gcd == 1:
+            break
+
+    return int(gcd)
 
 def decimals(n: float) -> int:
     """Get the number of decimals after comma."""
@@ -102,38 +217,63 @@ def get_indices_of_values_in_list(values: np.ndarray, lst: np.ndarray) -> np.nda
 
 #-------------------------------------------------------------------------------
 
-def normalize_values(values: ArrayLike) -> np.ndarray:
-    """Check input values before trying to plot them."""
-    values = np.asarray(values)
+def to_datetime64(values: Iterable[datetime]) -> np.ndarray:
+    """
+    Converts datetime objects to a datetime64[s] array, the same way as
+    `astype('datetime64[s]')` but without NumPy's slow per-object parsing.
 
-    if values.dtype in INT_DTYPES:
-        step = find_gcd(values)
-        max_value = np.max(values)
+    """
 
-        if max_value / step / DISPLAYABLE > 3:
-            round_to = int(math.log10(int(max_value / step / DISPLAYABLE))) + 1
-            values = np.around(values, decimals=-round_to)
+    if not all(issubclass(t, datetime) for t in set(map(type, values))):
+        raise TypeError('unknown input datatype')
 
-        return values
+    if any(value.tzinfo is not None for value in values):
+        # NumPy converts aware datetimes to UTC
+        return np.asarray(values, dtype=object).astype('datetime64[s]')
 
-    elif values.dtype in FLOAT_DTYPES:
-        scale = max([decimals(normalize_float(n)) for n in values])
-        step = 1 * (10 ** -scale)
-        max_value = normalize_float(np.max(values))
+    seconds = ((value.toordinal() - EPOCH_ORDINAL) * 86400 + value.hour * 3600 +
+               value.minute * 60 + value.second for value in values)
+    return np.fromiter(seconds, dtype=np.int64, count=len(values)).view('datetime64[s]')
 
-        if max_value / step / DISPLAYABLE > 3:
-            round_to = int(math.log10(int(max_value / step / DISPLAYABLE))) + 1
-            values = np.around(values, decimals=round_to)
+def normalize_values(values: ArrayLike, copy: bool = False, unit: str = None) -> np.ndarray:
+    """
+    Check input values before trying to plot them. NumPy arrays, memoryviews
+    and `array.array` of numbers or dates are not copied unless their values
+    have to be changed, pass copy=True to always get an array of your own.
 
-        return np.asarray([normalize_float(n) for n in values])
+    Integers are taken as dates since the epoch if their unit is given:
 
-    elif all([isinstance(e, datetime) for e in values]):
-        values = values.astype('datetime64[s]')
-        return values
+        normalize_values(timestamps, unit='ms')  # datetime64[ms] view
+
+    """
+
+    if unit is None and isinstance(values, (list, tuple)) and values and \
+       isinstance(values[0], datetime):
+        return to_datetime64(values)
+
+    values = np.asarray(values)
+
+    if unit is not None:
+        if unit not in EPOCH_UNITS:
+            raise ValueError(f"unknown epoch unit '{unit}', expected one of {EPOCH_UNITS}")
+        if values.dtype not in INT_DTYPES:
+            raise TypeError('epoch values must be integers')
+        values = values.astype(np.int64, copy=False).view(f'datetime64[{unit}]')
+
+    if values.dtype in INT_DTYPES:
+        return values.copy() if copy else values
+
+    elif values.dtype in FLOAT_DTYPES:
+        return normalize_floats(values, copy=copy)
 
     elif DATE_DTYPE in str(values.dtype):
-        values = values.astype('datetime64[s]')
-        return values
+        unit, _ = np.datetime_data(values.dtype)
+        if unit not in SUBSECOND_UNITS:
+            return values.astype('datetime64[s]', copy=copy)
+        return values.copy() if copy else values
+
+    elif values.dtype == object:
+        return to_datetime64(values)
 
     else:
         raise TypeError('unknown input datatype')
@@ -158,62 +298,70 @@ def choose_formatter(values: np.ndarray) -> Locator:
     else:
         raise TypeError('unknown input datatype')
 
+def choose_scale(values: np.ndarray, major_ticks: ArrayLike) -> Scale:
+    """Returns axis scale based on datatype."""
+    if values.dtype in INT_DTYPES or values.dtype in FLOAT_DTYPES:
+        return LinearScale(values, major_ticks)
+    elif DATE_DTYPE in str(values.dtype):
+        return DateScale(values, major_ticks)
+    else:
+        raise TypeError('unknown input datatype')
+
 #-------------------------------------------------------------------------------
 
-def frange(start: float, stop: float, step: float = None) -> Iterable[float]:
-    """Generates a range between float numbers."""
+# farange, frange, find_min_timedelta and smartrange are not used to draw
+# figures any more, ticks come from the locators of `ticker` and `dates`.
+# They are kept as public functions of the module.
+
+def farange(start: float, stop: float, step: float = None) -> np.ndarray:
+    """
+    Returns a range between float numbers, both ends included. The numbers
+    are counted as integers scaled by a power of ten, so they have exactly
+    as many decimals as the start, the stop and the step:
+
+        farange(0.1, 0.4, 0.1)  # [0.1, 0.2, 0.3, 0.4]
+
+    """
+
     start, stop = float(start), float(stop)
     if not step:
-        start_scale = len(str(start).split('.')[1])
-        stop_scale = len(str(stop).split('.')[1])
-        scale = max(start_scale, stop_scale)
-        step = 1 * (10 ** -scale)
+        step = 1 * (10 ** -max(decimals(start), decimals(stop)))
 
-    start, stop = Decimal(start).normalize(), Decimal(stop).normalize()
+    # shortest decimal representation of the floats, not limited to the
+    # 6 significant digits of the module's context
+    with localcontext(DefaultContext):
+        start, stop, step = (Decimal(repr(n)).normalize()
+                             for n in (start, stop, float(step)))
+        scale = max(-min(n.as_tuple().exponent for n in (start, stop, step)), 0)
+        start, stop, step = (int(n.scaleb(scale)) for n in (start, stop, step))
 
-    while start <= stop:
-        yield float(start)
-        start += Decimal(step).normalize()
+    return np.arange(start, stop + 1, step) / 10.0 ** scale
+
+def frange(start: float, stop: float, step: float = None) -> Iterable[float]:
+    """Generates a range between float numbers (see `farange`)."""
+    yield from farange(start, stop, step).tolist()
 
 #-------------------------------------------------------------------------------
 
+def _varies(component: np.ndarray) -> bool:
+    """Whether a date component is ever non-zero and not the same everywhere."""
+    return bool(component.any() and (component != component[0]).any())
+
 def find_min_timedelta(values: np.ndarray) -> dict:
     """Given an array of dates, finds the minimum timedelta parameters."""
-    datetime_values = [d.astype(datetime) for d in values]
+    values = np.asarray(values)
+    seconds = values.astype('datetime64[s]').astype(np.int64)
+    months = values.astype('datetime64[M]')
 
     changes = {
-        'seconds': 0,
-        'minutes': 0,
-        'hours': 0,
-        'days': 0,
-        'months': 0,
-        'years': 0
+        'seconds': _varies(seconds % 60),
+        'minutes': _varies(seconds // 60 % 60),
+        'hours': _varies(seconds // 3600 % 24),
+        'days': _varies((values.astype('datetime64[D]') - months).astype(np.int64) + 1),
+        'months': _varies(months.astype(np.int64) % 12 + 1),
+        'years': _varies(values.astype('datetime64[Y]').astype(np.int64) + 1970)
     }
 
-    if (any(d.second for d in datetime_values) and not
-        all(d.second == datetime_values[0].second for d in datetime_values)):
-        changes['seconds'] = 1
-
-    if (any(d.minute for d in datetime_values) and not
-        all(d.minute == datetime_values[0].minute for d in datetime_values)):
-        changes['minutes'] = 1
-
-    if (any(d.hour for d in datetime_values) and not
-        all(d.hour == datetime_values[0].hour for d in datetime_values)):
-        changes['hours'] = 1
-
-    if (any(d.day for d in datetime_values) and not
-        all(d.day == datetime_values[0].day for d in datetime_values)):
-        changes['days'] = 1
-
-    if (any(d.month for d in datetime_values) and not
-        all(d.month == datetime_values[0].month for d in datetime_values)):
-        changes['months'] = 1
-
-    if (any(d.year for d in datetime_values) and not
-        all(d.year == datetime_values[0].year for d in datetime_values)):
-        changes['years'] = 1
-
     if changes['years'] or changes['months']:
         return np.timedelta64(1, 'D')
     elif changes['days']:
@@ -233,12 +381,11 @@ def smartrange(vmin: Number, vmax: Number, origin_values: np.ndarray) -> np.ndar
     if isinstance(vmin, (float, int)) and isinstance(vmax, (float, int)):
 
         if (isint(vmin) and isint(vmax) and origin_values.dtype in INT_DTYPES):
-            all_values = np.append(origin_values, [int(vmin), int(vmax)])
-            step = find_gcd(all_values)
+            step = math.gcd(math.gcd(find_gcd(origin_values), int(vmin)), int(vmax))
             n_range = np.arange(int(vmin), int(vmax) + 1, step)
             #-------------------------------------------------------------------
             if max([abs(n) for n in n_range]) <= 10 and len(n_range) <= 5:
-                return np.asarray([i for i in frange(vmin, vmax, 0.1)])
+                return farange(vmin, vmax, 0.1)
             #-------------------------------------------------------------------
             return n_range
 
@@ -251,7 +398,7 @@ def smartrange(vmin: Number, vmax: Number, origin_values: np.ndarray) -> np.ndar
             scale = max(start_scale, stop_scale, origin_scale)
             step = 1 * (10 ** -scale)
 
-            return np.asarray([i for i in frange(vmin, vmax, step)])
+            return farange(vmin, vmax, step)
 
     elif DATE_DTYPE in str(origin_values.dtype):
         delta = find_min_timedelta(origin_values)
@@ -9,10 +9,12 @@ between axes' values and image coordinates.
 
 """
 
-__all__ = ('Spines', 'PointsGrid')
+__all__ = ('LABEL_CACHE', 'Spines', 'PointsGrid', 'Transform')
 
-from .base import Coords, Theme, Point, Axes
-from .utils import (get_text_dimensions, get_indices_of_values_in_list)
+from .base import Coords, Theme, Point, Axes, Size
+from .utils import get_text_dimensions
+from .markers import get_marker_sprite, stamp_sprite
+from .cache import LRUCache
 
 from numbers import Number
 from PIL import Image, ImageFont, ImageDraw
@@ -21,24 +23,36 @@ import numpy as np
 
 #-------------------------------------------------------------------------------
 
-def _point_in_bbox(point: Point, bbox: Coords) -> bool:
-    if (bbox.x0 <= point.x and point.x <= bbox.x1 and
-        bbox.y0 <= point.y and point.y <= bbox.y1):
-
-        return True
-
-    else:
-        return False
+# rotated label bitmaps keyed by (text, font path, font size, fill, rotation,
+# antialias), fill is None for the 8-bit masks composed by glyph atlases
+LABEL_CACHE = LRUCache(maxsize=256)
 
 #-------------------------------------------------------------------------------
 
 class CustomImageDraw(ImageDraw.ImageDraw):
+    antialias = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    @property
+    def image(self) -> Image.Image:
+        """The image being drawn on."""
+        return self._image
+
+    def line(self, xy, *args, **kwargs):
+        """Draws a line, (N, 2) coordinate arrays are accepted as they are."""
+        if isinstance(xy, np.ndarray):
+            xy = xy.ravel().tolist()
+        super().line(xy, *args, **kwargs)
+
     def rtext(self, *args, **kwargs):
-        """Allows drawing rotated text."""
+        """
+        Allows drawing rotated text. Rotated labels are rendered once and then
+        pasted from `LABEL_CACHE`.
+
+        """
+
         rotation = kwargs.pop('rotation')
 
         if not rotation:
@@ -48,19 +62,104 @@ class CustomImageDraw(ImageDraw.ImageDraw):
             xy = kwargs.pop('xy')
             text = kwargs.pop('text')
             font = kwargs.pop('font')
-            fill = kwargs.pop('fill')
+            fill = tuple(kwargs.pop('fill'))
 
-            text_width, text_height = get_text_dimensions(text, font)
+            key = (text, getattr(font, 'path', id(font)), font.size, fill, rotation,
+                   self.antialias)
+            mask = LABEL_CACHE.get(key)
 
-            mask = Image.new('RGBA', (text_width, text_height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(mask)
-            draw.text((0, 0), text=text, font=font, fill=(*fill, 255))
-            mask = mask.rotate(rotation, expand=True)
+            if mask is None:
+                mask = self._render_rotated_text(text, font, fill, rotation,
+                                                 self.antialias)
+                LABEL_CACHE[key] = mask
 
             x = int(xy[0]) - mask.size[0] + int(mask.size[0] * 0.1)
             y = int(xy[1]) - int(mask.size[1] * 0.1)
             self._image.paste(mask, (x, y), mask)
 
+    @staticmethod
+    def _render_rotated_text(text: str, font: ImageFont, fill: tuple,
+                             rotation: float, antialias: bool = False) -> Image.Image:
+        """
+        Renders text into a transparent RGBA image and rotates it. Anti-aliased
+        text is rotated as a coverage mask with bicubic resampling, so its edges
+        stay smooth without being darkened by the transparent background.
+
+        """
+
+        text_width, text_height = get_text_dimensions(text, font)
+
+        if antialias:
+            mask = Image.new('L', (text_width, text_height), 0)
+            ImageDraw.Draw(mask).text((0, 0), text=text, font=font, fill=255)
+            alpha = mask.rotate(rotation, expand=True, resample=Image.BICUBIC)
+            mask.close()
+
+            rotated = Image.new('RGBA', alpha.size, (*fill, 255))
+            rotated.putalpha(alpha)
+            alpha.close()
+            return rotated
+
+        mask = Image.new('RGBA', (text_width, text_height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(mask)
+        draw.text((0, 0), text=text, font=font, fill=(*fill, 255))
+        rotated = mask.rotate(rotation, expand=True)
+        mask.close()
+
+        return rotated
+
+    def markers(self, xy: np.ndarray, marker: str, size: int, fill) -> None:
+        """Stamps the same marker at all (N, 2) point coordinates at once."""
+        if not len(xy):
+            return
+
+        sprite = get_marker_sprite(marker, size, fill, self.antialias)
+        coverage, (x0, y0) = stamp_sprite(np.asarray(xy), sprite)
+
+        mask = Image.fromarray(coverage)
+        box = (x0, y0, x0 + mask.size[0], y0 + mask.size[1])
+        self._image.paste(sprite.color, box, mask)
+        mask.close()
+
+#-------------------------------------------------------------------------------
+
+class Transform(object):
+
+    def __init__(self, origin: Number, step: Number, scale: float,
+                 offset: float) -> None:
+        """
+        Initializes Transform instance responsible for mapping whole arrays of
+        axis values to image coordinates with a single affine operation:
+
+            coords = offset + (values - origin) / step * scale
+
+        Zero scale maps every value to the offset, which is how a single
+        tick gets centered.
+
+        """
+
+        self.origin = origin
+        self.step = step
+        self.scale = scale
+        self.offset = offset
+
+    def __call__(self, values: np.ndarray, dtype: type = np.float64) -> np.ndarray:
+        """Returns contiguous array of coordinates of the given values."""
+        values = np.asarray(values)
+
+        if not self.scale:
+            coords = np.full(values.shape, self.offset, dtype=np.float64)
+
+        else:
+            coords = np.subtract(values, self.origin) / self.step
+            coords *= self.scale
+            coords += self.offset
+
+        if np.issubdtype(dtype, np.integer):
+            return np.rint(coords, out=coords).astype(dtype)
+
+        return np.ascontiguousarray(coords, dtype=dtype)
+
 #-------------------------------------------------------------------------------
 
 class Spines(object):
@@ -150,95 +249,104 @@ class PointsGrid(object):
 
         self.tick_length = self.spines.width * self.theme.tick_length_perc
 
-        self.xvalues = None
-        self.yvalues = None
+        self.x_scale = None
+        self.y_scale = None
 
-        self.x_major_ticks = None
-        self.x_major_ticks = None
+    @property
+    def x_transform(self) -> Transform:
+        """Transform of numeric X values into horizontal image coordinates."""
+        scale = self.x_scale
+        vmin, vmax = scale.to_numeric([scale.vmin, scale.vmax])
+        if scale.single:
+            return Transform(vmin, 1, 0, self.full_h_offset + self.width * 0.5)
 
-        self.cell_width = None
-        self.cell_height = None
+        return Transform(vmin, vmax - vmin, self.width, self.full_h_offset)
 
-    def get_x_line_coords(self, x_index: int) -> Coords:
-        """Get coordinates of internal grid vertical line."""
-        _x_offset = self.cell_width * x_index
-        if len(self.x_major_ticks) == 1:
-            _x_offset = self.width * 0.5
+    @property
+    def y_transform(self) -> Transform:
+        """Transform of numeric Y values into vertical image coordinates."""
+        scale = self.y_scale
+        vmin, vmax = scale.to_numeric([scale.vmin, scale.vmax])
+        if scale.single:
+            return Transform(vmin, 1, 0, self.full_v_offset + self.height * 0.5)
 
+        return Transform(vmin, vmax - vmin, -self.height,
+                         self.full_v_offset + self.height)
+
+    def get_x_coords(self, values: np.ndarray, dtype: type = np.float64) -> np.ndarray:
+        """Get horizontal image coordinates of X values."""
+        return self.x_transform(self.x_scale.to_numeric(values), dtype=dtype)
+
+    def get_y_coords(self, values: np.ndarray, dtype: type = np.float64) -> np.ndarray:
+        """Get vertical image coordinates of Y values."""
+        return self.y_transform(self.y_scale.to_numeric(values), dtype=dtype)
+
+    @property
+    def x_major_ticks(self) -> np.ndarray:
+        """Horizontal image coordinates of X major ticks."""
+        return self.get_x_coords(self.x_scale.major_ticks)
+
+    @property
+    def y_major_ticks(self) -> np.ndarray:
+        """Vertical image coordinates of Y major ticks."""
+        return self.get_y_coords(self.y_scale.major_ticks)
+
+    def get_x_line_coords(self, x: Number) -> Coords:
+        """Get coordinates of internal grid vertical line."""
         return Coords(
-            self.full_h_offset + _x_offset,
+            x,
             self.spines.vertical_offset,
-            self.full_h_offset + _x_offset,
+            x,
             self.full_v_offset + self.vertical_offset + self.height
         )
 
-    def get_y_line_coords(self, y_index: int) -> Coords:
+    def get_y_line_coords(self, y: Number) -> Coords:
         """Get coordinates of internal grid horizontal line."""
-        _y_offset = self.cell_height * y_index
-        if len(self.y_major_ticks) == 1:
-            _y_offset = self.height * 0.5
-
         return Coords(
             self.spines.horizontal_offset,
-            self.full_v_offset + self.height - _y_offset,
+            y,
             self.full_h_offset + self.horizontal_offset + self.width,
-            self.full_v_offset + self.height - _y_offset
+            y
         )
 
-    def get_x_tick_coords(self, x_index: int) -> Coords:
+    def get_x_tick_coords(self, x: Number) -> Coords:
         """Get coordinates of vertically oriented tick."""
-        _x_offset = self.cell_width * x_index
-        if len(self.x_major_ticks) == 1:
-            _x_offset = self.width * 0.5
-
         return Coords(
-            self.full_h_offset + _x_offset,
+            x,
             self.full_v_offset + self.vertical_offset + self.height,
-            self.full_h_offset + _x_offset,
+            x,
             self.full_v_offset + self.vertical_offset + self.height + self.tick_length
         )
 
-    def get_y_tick_coords(self, y_index: int) -> Coords:
+    def get_y_tick_coords(self, y: Number) -> Coords:
         """Get coordinates of horizontally oriented tick."""
-        _y_offset = self.cell_height * y_index
-        if len(self.y_major_ticks) == 1:
-            _y_offset = self.height * 0.5
-
         return Coords(
             self.spines.horizontal_offset - self.tick_length,
-            self.full_v_offset + self.height - _y_offset,
+            y,
             self.spines.horizontal_offset,
-            self.full_v_offset + self.height - _y_offset
+            y
         )
 
-    def get_x_tick_label_coords(self, x_index: int, text: str,
-                                font: ImageFont) -> Point:
-        """Get coordinates of X tick label."""
-        _x_offset = self.cell_width * x_index
-        if len(self.x_major_ticks) == 1:
-            _x_offset = self.width * 0.5
-
-        text_width, text_height = get_text_dimensions(text, font)
+    def get_x_tick_label_coords(self, x: Number, text: str,
+                                font: ImageFont, size: Size = None) -> Point:
+        """Get coordinates of X tick label, measured unless its size is given."""
+        text_width, text_height = size or get_text_dimensions(text, font)
 
         return Point(
-            self.full_h_offset + _x_offset,
+            x,
             self.full_v_offset + self.vertical_offset + self.height \
                                         + self.tick_length * 2      \
                                         + text_height / 2,
         )
 
-    def get_y_tick_label_coords(self, y_index: int, text: str,
-                                font: ImageFont) -> Point:
-        """Get coordinates of Y tick label."""
-        _y_offset = self.cell_height * y_index
-        if len(self.y_major_ticks) == 1:
-            _y_offset = self.height * 0.5
-
-        text_width, text_height = get_text_dimensions(text, font)
+    def get_y_tick_label_coords(self, y: Number, text: str,
+                                font: ImageFont, size: Size = None) -> Point:
+        """Get coordinates of Y tick label, measured unless its size is given."""
+        text_width, text_height = size or get_text_dimensions(text, font)
 
         return Point(
             self.spines.horizontal_offset - self.tick_length * 2 - text_width / 2,
-            self.full_v_offset + self.height - _y_offset,
+            y,
         )
 
     def get_title_coords(self, text: str, font: ImageFont) -> Point:
@@ -250,36 +358,22 @@ class PointsGrid(object):
             self.spines.vertical_offset - self.tick_length * 2 - text_height / 2,
         )
 
-    def get_x_point_coords(self, x_index: int) -> Number:
-        """Get coordinates of point on x-axis by X index."""
-        _x_offset = self.cell_width * x_index
-        if len(self.x_major_ticks) == 1:
-            _x_offset = self.width * 0.5
-        return self.full_h_offset + _x_offset
-
-    def get_y_point_coords(self, y_index: int) -> Number:
-        """Get coordinates of point on y-axis by Y index."""
-        _y_offset = self.cell_height * y_index
-        if len(self.y_major_ticks) == 1:
-            _y_offset = self.height * 0.5
-        return self.full_v_offset + self.height - _y_offset
-
-    def get_point_coords(self, x_index: int, y_index: int) -> Point:
-        """Get coordinates of point by X and Y indices."""
-        x_coords = self.get_x_point_coords(x_index)
-        y_coords = self.get_y_point_coords(y_index)
-        return Point(x_coords, y_coords)
-
-    def get_axes_points_coords(self, axes: Axes) -> List[Point]:
-        """Get coordinates of all points within axes."""
-        px = get_indices_of_values_in_list(axes.xvalues, self.xvalues)
-        py = get_indices_of_values_in_list(axes.yvalues, self.yvalues)
-
-        xy_indices = np.dstack(np.asarray([px, py]))[0]
-        return np.asarray([self.get_point_coords(x, y) for x, y in xy_indices])
-
-    def get_legend_bbox(self, axes: List[Axes], font: ImageFont) -> dict:
-        """Returns coordinates of legend mask."""
+    def get_axes_points_coords(self, axes: Axes, dtype: type = np.float64) -> np.ndarray:
+        """Get coordinates of all points within axes as (N, 2) array."""
+        coords = np.empty((len(axes.xvalues), 2), dtype=dtype)
+        coords[:, 0] = self.get_x_coords(axes.xvalues, dtype=dtype)
+        coords[:, 1] = self.get_y_coords(axes.yvalues, dtype=dtype)
+        return coords
+
+    def get_legend_bbox(self, axes: List[Axes], font: ImageFont,
+                        points: List[np.ndarray] = None) -> dict:
+        """
+        Returns coordinates of legend mask, in the section of the grid with
+        the fewest points. Image coordinates of the points of every axes can
+        be passed if they are already computed.
+
+        """
+
         priority = {
             '00': 0, '10': 6, '20': 1,
             '01': 4, '11': 8, '21': 5,
@@ -315,16 +409,25 @@ class PointsGrid(object):
                 sections[priority[f'{x}{y}']]['bbox'] = coords
                 sections[priority[f'{x}{y}']]['point'] = point
 
-        pts = [self.get_axes_points_coords(ax) for ax in axes]
-        points = np.concatenate(pts)
+        if points is None:
+            points = [self.get_axes_points_coords(ax) for ax in axes]
+        points = np.concatenate(points)
 
-        for p in points:
-            point = Point(p[0], p[1])
-            for sk, sv in enumerate(sections):
-                if 'hits' not in sections[sk]:
-                    sections[sk]['hits'] = 0
-                if _point_in_bbox(point, sv['bbox']):
-                    sections[sk]['hits'] += 1
+        # sections are closed boxes sharing their edges, so a point on an edge
+        # is counted in both sections: hits[x, y] = columns[:, x] @ rows[:, y]
+        x_edges = [sections[priority[f'{x}0']]['bbox'].x0 for x in range(3)]
+        x_edges.append(sections[priority['20']]['bbox'].x1)
+        y_edges = [sections[priority[f'0{y}']]['bbox'].y0 for y in range(3)]
+        y_edges.append(sections[priority['02']]['bbox'].y1)
+
+        xs, ys = points[:, 0, None], points[:, 1, None]
+        columns = (xs >= x_edges[:-1]) & (xs <= x_edges[1:])
+        rows = (ys >= y_edges[:-1]) & (ys <= y_edges[1:])
+        hits = columns.T.astype(np.int64) @ rows.astype(np.int64)
+
+        for x in range(3):
+            for y in range(3):
+                sections[priority[f'{x}{y}']]['hits'] = int(hits[x, y])
 
         section = sorted(sections, key=lambda d: d['hits'])[0]
         return section
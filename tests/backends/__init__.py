@@ -0,0 +1 @@
+from .test_backends import TestBackends
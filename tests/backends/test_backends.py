@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+from simpleplots.backends import (ArrayImageDraw, AntialiasedImageDraw, create_draw,
+                                  rasterize_lines)
+from simpleplots import Figure
+import simpleplots.backends
+import tracemalloc
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------
+
+class TestBackends(unittest.TestCase):
+
+    def test_rasterize_horizontal_line(self):
+        mask, (x0, y0) = rasterize_lines(np.asarray([[10, 20], [30, 20]]), 4, (100, 100))
+        ys, xs = np.nonzero(mask)
+
+        with self.subTest():
+            self.assertListEqual(sorted(set(ys + y0)), [18, 19, 20, 21])
+
+        with self.subTest():
+            self.assertTupleEqual((min(xs + x0), max(xs + x0)), (10, 30))
+
+    def test_rasterize_vertical_line(self):
+        mask, (x0, y0) = rasterize_lines(np.asarray([[50, 0], [50, 99]]), 1, (100, 100))
+        ys, xs = np.nonzero(mask)
+
+        with self.subTest():
+            self.assertListEqual(sorted(set(xs + x0)), [50])
+
+        with self.subTest():
+            self.assertEqual(len(ys), 100)
+
+    def test_rasterize_clipped_line(self):
+        mask, (x0, y0) = rasterize_lines(np.asarray([[-50, -50], [150, 150]]), 3, (100, 100))
+
+        with self.subTest():
+            self.assertTupleEqual((x0, y0), (0, 0))
+
+        with self.subTest():
+            self.assertTupleEqual(mask.shape, (100, 100))
+
+        with self.subTest():
+            self.assertTrue(mask[0, 0] and mask[99, 99])
+
+    def test_rasterize_antialiased_line(self):
+        mask, (x0, y0) = rasterize_lines(np.asarray([[10, 20.5], [30, 20.5]]), 1,
+                                         (100, 100), antialias=True)
+
+        with self.subTest():
+            self.assertEqual(mask.dtype, np.uint8)
+
+        with self.subTest():
+            self.assertListEqual(mask[20 - y0:22 - y0, 20 - x0].tolist(), [128, 128])
+
+        with self.subTest():
+            self.assertEqual(mask[22 - y0, 20 - x0], 0)
+
+    def test_rasterize_antialiased_wide_line(self):
+        mask, (x0, y0) = rasterize_lines(np.asarray([[10, 20.25], [30, 20.25]]), 3,
+                                         (100, 100), antialias=True)
+
+        self.assertListEqual(mask[18 - y0:23 - y0, 20 - x0].tolist(),
+                             [0, 191, 255, 255, 64])
+
+    def test_rasterize_lines_in_bands(self):
+        rng = np.random.default_rng(0)
+        points = np.stack([np.linspace(0, 1600, 2000), rng.uniform(0, 1200, 2000)], axis=1)
+        band_size = simpleplots.backends.RASTER_BAND_SIZE
+
+        for antialias in (False, True):
+            try:
+                simpleplots.backends.RASTER_BAND_SIZE = 1 << 30
+                expected, offset = rasterize_lines(points, 2.5, (1600, 1200), antialias)
+            finally:
+                simpleplots.backends.RASTER_BAND_SIZE = band_size
+
+            tracemalloc.start()
+            to_test, to_test_offset = rasterize_lines(points, 2.5, (1600, 1200), antialias)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            with self.subTest(antialias=antialias):
+                self.assertTupleEqual(to_test_offset, offset)
+                self.assertTrue(np.array_equal(to_test, expected))
+
+            with self.subTest(antialias=antialias):
+                # the mask, one band and one chunk of steps, never the whole canvas in int32
+                self.assertLess(peak, to_test.nbytes + band_size * 8 + (1 << 15) * 256)
+
+    def test_array_draw_line(self):
+        draw = ArrayImageDraw((40, 30), (255, 255, 255))
+        draw.line(np.asarray([[5, 10], [35, 10]]), fill='red', width=1)
+
+        with self.subTest():
+            self.assertListEqual(draw.buffer[10, 20].tolist(), [255, 0, 0])
+
+        with self.subTest():
+            self.assertListEqual(draw.buffer[20, 20].tolist(), [255, 255, 255])
+
+    def test_antialiased_draw(self):
+        for backend in ('pil', 'numpy'):
+            with self.subTest(backend=backend):
+                draw = create_draw(backend, (40, 30), (255, 255, 255), antialias=True)
+                draw.line(np.asarray([[5, 10.5], [35, 10.5]]), fill=(0, 0, 0), width=1)
+                buffer = np.asarray(draw.image)
+                self.assertListEqual(buffer[10:12, 20].tolist(), [[127, 127, 127]] * 2)
+
+        with self.subTest():
+            self.assertIsInstance(create_draw('pil', (1, 1), (0, 0, 0), antialias=True),
+                                  AntialiasedImageDraw)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_draw('svg', (10, 10), (255, 255, 255))
+
+        with self.assertRaises(ValueError):
+            Figure(backend='svg')
+
+    def test_numpy_backend_figure(self):
+        fig = Figure(backend='numpy')
+        fig.plot([0, 1, 2, 3], [3, 1, 2, 0], linewidth=5, label='line')
+        fig.legend()
+        array = fig.to_array()
+        fig.close()
+
+        with self.subTest():
+            self.assertTupleEqual(array.shape, (1200, 1600, 3))
+
+        with self.subTest():
+            self.assertTrue(np.any(np.all(array == [255, 0, 0], axis=2)))
+
+#-----------------------------------------------------------------------------
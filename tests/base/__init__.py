@@ -0,0 +1 @@
+from .test_base import TestBase
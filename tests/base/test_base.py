@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from simpleplots.base import Axes
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------
+
+class TestBase(unittest.TestCase):
+
+    def _axes(self, xvalues, yvalues, **kwargs):
+        return Axes(xvalues, yvalues, 'red', 4, 'solid', 'o', 4, 'line', **kwargs)
+
+    def test_axes_keeps_values_once(self):
+        xvalues, yvalues = np.arange(10), np.linspace(0, 1, 10)
+        axes = self._axes(xvalues, yvalues)
+
+        with self.subTest():
+            self.assertFalse(hasattr(axes, '__dict__'))
+
+        with self.subTest():
+            self.assertEqual(axes.nbytes, xvalues.nbytes + yvalues.nbytes)
+
+        with self.subTest():
+            self.assertListEqual(axes.points.tolist(),
+                                 np.column_stack((xvalues, yvalues)).tolist())
+
+    def test_axes_dtype(self):
+        xvalues = np.arange('2022-01-01', '2022-01-11', dtype='datetime64[D]')
+        axes = self._axes(xvalues.astype('datetime64[s]'), np.arange(10.0),
+                          dtype=np.float32)
+
+        with self.subTest():
+            self.assertEqual(axes.xvalues.dtype, np.dtype('datetime64[s]'))
+
+        with self.subTest():
+            self.assertEqual(axes.yvalues.dtype, np.float32)
+
+        with self.subTest():
+            self.assertEqual(axes.points[1, 1], 1.0)
+
+        with self.subTest():
+            self.assertRaises(TypeError, self._axes, np.arange(10),
+                              np.arange(10.0), dtype=np.int32)
+
+    def test_axes_dtype_range(self):
+        with self.subTest():
+            self.assertRaises(ValueError, self._axes, np.asarray([0, 2 ** 40]),
+                              np.arange(2), dtype=np.int32)
+
+        with self.subTest():
+            self.assertRaises(ValueError, self._axes, np.arange(2),
+                              np.asarray([0.5, 1e6]), dtype=np.float16)
+
+        with self.subTest():
+            axes = self._axes(np.asarray([0, 2 ** 30]), np.asarray([np.nan, 1e6]),
+                              dtype=np.float32)
+            self.assertListEqual(axes.xvalues.tolist(), [0, 2 ** 30])
+
+        with self.subTest():
+            axes = self._axes(np.asarray([-5, 100]), np.asarray([1, 2]), dtype=np.int8)
+            self.assertEqual(axes.xvalues.dtype, np.int8)
+
+    def test_axes_shape_mismatch(self):
+        self.assertRaises(ValueError, self._axes, np.arange(10), np.arange(9))
+
+#-----------------------------------------------------------------------------
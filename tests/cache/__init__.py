@@ -0,0 +1 @@
+from .test_cache import TestCache
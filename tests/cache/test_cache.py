@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+from simpleplots.cache import LRUCache
+from simpleplots.figure import CHROME_CACHE
+from simpleplots import Figure
+import threading
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------
+
+class TestCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache['c'] = 3
+
+        with self.subTest():
+            self.assertListEqual(['a' in cache, 'b' in cache, 'c' in cache],
+                                 [True, False, True])
+
+        with self.subTest():
+            self.assertEqual(len(cache), 2)
+
+    def test_counters(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+
+        with self.subTest():
+            self.assertEqual(cache.get('a'), 1)
+
+        with self.subTest():
+            self.assertIsNone(cache.get('b'))
+
+        with self.subTest():
+            self.assertTupleEqual(tuple(cache.info()), (1, 1, 2, 1))
+
+        cache.clear()
+
+        with self.subTest():
+            self.assertTupleEqual(tuple(cache.info()), (0, 0, 2, 0))
+
+    def test_zero_maxsize(self):
+        cache = LRUCache(maxsize=0)
+        cache['a'] = 1
+        self.assertEqual(len(cache), 0)
+
+    def test_threads(self):
+        cache = LRUCache(maxsize=8)
+
+        def work(offset):
+            for i in range(2000):
+                cache[(offset + i) % 16] = i
+                cache.get((offset + i * 7) % 16)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with self.subTest():
+            self.assertEqual(len(cache), 8)
+
+        with self.subTest():
+            self.assertEqual(sum(cache.info()[:2]), 4 * 2000)
+
+    def test_chrome_cache(self):
+        arrays = list()
+        CHROME_CACHE.clear()
+
+        for _ in range(2):
+            fig = Figure(size=(500, 300), chrome_cache=True)
+            fig.plot([1, 2, 3], [1, 2, 3], color='red', linewidth=7)
+            arrays.append(fig.to_array())
+            fig.close()
+
+        with self.subTest():
+            self.assertTupleEqual(CHROME_CACHE.info()[:2], (1, 1))
+
+        with self.subTest():
+            self.assertTrue(np.array_equal(arrays[0], arrays[1]))
+
+        fig = Figure(size=(500, 300), chrome_cache=True)
+        fig.plot([1, 2, 30], [1, 2, 3], color='red', linewidth=7)
+        fig.to_array()
+        fig.close()
+
+        with self.subTest():
+            self.assertTupleEqual(CHROME_CACHE.info()[:2], (1, 2))
+
+        fig = Figure(size=(500, 300))
+        fig.plot([1, 2, 3], [1, 2, 3], color='red', linewidth=7)
+        fig.to_array()
+        fig.close()
+
+        with self.subTest():
+            self.assertTupleEqual(tuple(CHROME_CACHE.info()), (1, 2, 4, 2))
+
+#-----------------------------------------------------------------------------
@@ -107,6 +107,22 @@ class TestDates(unittest.TestCase):
         ]
         self.assertListEqual(expected, to_test)
 
+    def test_autodatelocator_matches_rrule_locators(self):
+        loc = AutoDateLocator()
+        vmin = np.datetime64('2021-11-29T17:43:21.250000')
+        spans = ['40s', '25m', '9h', '3D', '40D', '250D', '7Y', '150Y']
+
+        for span in spans:
+            number, unit = int(span[:-1]), span[-1]
+            if unit == 'Y':
+                vmax = vmin + np.timedelta64(number * 365, 'D')
+            else:
+                vmax = vmin + np.timedelta64(number, unit)
+
+            with self.subTest(span=span):
+                expected = loc.get_locator(vmin, vmax).tick_values(vmin, vmax)
+                self.assertListEqual(loc.tick_values(vmin, vmax), expected)
+
     def test_autodatelocator_years(self):
         loc = AutoDateLocator()
 
@@ -128,4 +144,37 @@ class TestDates(unittest.TestCase):
         ]
         self.assertListEqual(expected, to_test)
 
+    def test_dateformatter_format_ticks(self):
+        values = np.asarray(['0999-05-01T10:20:30', '1969-12-31T23:59:59',
+                             '2022-01-15T08:05:00'], dtype='datetime64[s]')
+        formats = ['%Y', '%Y-%m', '%Y-%m-%d', '%Y-%m-%d %H:%M',
+                   '%Y-%m-%d %H:%M:%S', '%H:%M', '%H:%M:%S', '%d.%m.%Y']
+
+        for fmt in formats:
+            formatter = DateFormatter(fmt)
+
+            with self.subTest(fmt=fmt):
+                expected = [formatter(value) for value in values]
+                self.assertListEqual(formatter.format_ticks(values), expected)
+
+            with self.subTest(fmt=fmt):
+                expected = [formatter(value) for value in values[1:]]
+                self.assertListEqual(formatter.format_ticks(values[1:]), expected)
+
+    def test_autodateformatter_format_ticks(self):
+        formatter = AutoDateFormatter()
+        values = np.asarray(['2022-01-01', '2022-01-02'], dtype='datetime64[s]')
+
+        with self.subTest():
+            self.assertListEqual(formatter.format_ticks(values),
+                                 ['2022-01-01', '2022-01-02'])
+
+        with self.subTest():
+            self.assertIs(formatter._get_formatter(), formatter._get_formatter())
+
+        formatter.defaultfmt = '%d.%m'
+
+        with self.subTest():
+            self.assertListEqual(formatter.format_ticks(values), ['01.01', '02.01'])
+
 #-----------------------------------------------------------------------------
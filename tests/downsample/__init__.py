@@ -0,0 +1 @@
+from .test_downsample import TestDownsample
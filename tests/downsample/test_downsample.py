@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+from simpleplots.downsample import is_sorted, m4, lttb, lttb_indices
+from simpleplots.backends import rasterize_lines
+from simpleplots import Figure
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------
+
+class TestDownsample(unittest.TestCase):
+
+    def test_is_sorted(self):
+        with self.subTest():
+            self.assertTrue(is_sorted(np.asarray([1, 2, 2, 5])))
+
+        with self.subTest():
+            self.assertFalse(is_sorted(np.asarray([1, 3, 2])))
+
+    def test_m4(self):
+        coords = np.asarray([[0.1, 5], [0.2, 9], [0.3, 1], [0.4, 7], [0.45, 6],
+                             [1.1, 3], [1.2, 4]])
+        to_test = m4(coords)
+
+        self.assertListEqual(to_test.tolist(), [[0.1, 5], [0.2, 9], [0.3, 1], [0.45, 6],
+                                                [1.1, 3], [1.2, 4]])
+
+    def test_m4_short(self):
+        coords = np.asarray([[0.1, 5], [0.2, 9]])
+        self.assertIs(m4(coords), coords)
+
+    def test_m4_close_to_full(self):
+        rng = np.random.default_rng(0)
+        x = np.linspace(10, 790, 20000)
+        y = 300 + np.cumsum(rng.standard_normal(20000))
+        coords = np.stack([x, y], axis=1)
+        reduced = m4(coords)
+
+        with self.subTest():
+            self.assertLessEqual(len(reduced), 4 * 781)
+
+        full, full_xy = rasterize_lines(coords, 1, (800, 600))
+        part, part_xy = rasterize_lines(reduced, 1, (800, 600))
+
+        with self.subTest():
+            self.assertTupleEqual(full_xy, part_xy)
+
+        # not the same pixels, but every pixel of either line is at most one
+        # pixel away from the other one
+        for a, b in [(full, part), (part, full)]:
+            padded = np.pad(b, 1)
+            near = np.zeros_like(b)
+            for dy in range(3):
+                for dx in range(3):
+                    near |= padded[dy:dy + b.shape[0], dx:dx + b.shape[1]]
+
+            with self.subTest():
+                self.assertTrue(np.all(near[a]))
+
+    def test_lttb_indices(self):
+        to_test = lttb_indices([0, 1, 2, 3, 4], [0, 5, 0, -1, 0], 3)
+        self.assertListEqual(to_test.tolist(), [0, 1, 4])
+
+    def test_lttb_length(self):
+        rng = np.random.default_rng(0)
+        yvalues = rng.standard_normal(10000)
+        to_test = lttb_indices(np.arange(10000), yvalues, 100)
+
+        with self.subTest():
+            self.assertEqual(len(to_test), 100)
+
+        with self.subTest():
+            self.assertListEqual([to_test[0], to_test[-1]], [0, 9999])
+
+        with self.subTest():
+            self.assertTrue(is_sorted(to_test))
+
+        with self.subTest():
+            self.assertEqual(len(lttb_indices(np.arange(50), yvalues[:50], 100)), 50)
+
+    def test_lttb_dates(self):
+        xvalues = np.arange('2021-01-01', '2021-02-01', dtype='datetime64[h]').astype('datetime64[s]')
+        yvalues = np.arange(len(xvalues)) % 24
+        x, y = lttb(xvalues, yvalues, 31)
+
+        with self.subTest():
+            self.assertEqual(x.dtype, np.dtype('datetime64[s]'))
+
+        with self.subTest():
+            self.assertTupleEqual((len(x), len(y)), (31, 31))
+
+        with self.subTest():
+            self.assertTrue(np.all(np.diff(x) > np.timedelta64(0, 's')))
+
+    def test_plot_downsample(self):
+        fig = Figure(size=(500, 300))
+
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                fig.plot([1, 2, 3], [1, 2, 3], downsample='mean')
+
+        for downsample in ['m4', 'lttb']:
+            with self.subTest(downsample=downsample):
+                with self.assertRaises(ValueError):
+                    fig.plot([3, 2, 1], [1, 2, 3], downsample=downsample)
+
+        with self.subTest():
+            self.assertListEqual(fig.axes, [])
+
+        fig.close()
+
+    def test_plot_lttb(self):
+        fig = Figure(size=(500, 300))
+        fig.plot(np.arange(100000), np.arange(100000) % 100, downsample='lttb',
+                 max_points=500)
+        to_test = fig.to_array()
+        points = fig.grid.get_axes_points_coords(fig.axes[0])
+
+        with self.subTest():
+            self.assertEqual(len(fig._reduce_points(points, 500)), 500)
+
+        with self.subTest():
+            self.assertTupleEqual(to_test.shape, (300, 500, 3))
+
+        fig.close()
+
+    def test_plot_large_series(self):
+        fig = Figure(size=(500, 300))
+        fig.plot(np.arange(100000), np.arange(100000) % 100, marker=None,
+                 downsample='auto')
+        to_test = fig.to_array()
+        points = fig.grid.get_axes_points_coords(fig.axes[0])
+
+        with self.subTest():
+            self.assertLessEqual(len(fig._reduce_line(points, 'auto')), 4 * fig.grid.width)
+
+        with self.subTest():
+            self.assertTupleEqual(to_test.shape, (300, 500, 3))
+
+        fig.close()
+
+#-----------------------------------------------------------------------------
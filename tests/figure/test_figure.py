@@ -4,6 +4,7 @@ from simpleplots import Figure
 from simpleplots.dates import (YearLocator, YearLocator, MonthLocator,
                                WeekdayLocator, DayLocator, HourLocator,
                                MinuteLocator, SecondLocator, DateFormatter)
+from simpleplots.ticker import AutoLocator, AutoFormatter
 import platform
 import unittest
 import numpy as np
@@ -24,83 +25,101 @@ class TestFigure(unittest.TestCase):
     def test_plot_integers_without_gaps(self):
         fig = Figure(size=(500, 300))
         fig.plot([2, 3, 4], [1, 2, 3], color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [36.0, 18.9]
+        expected = [2.0, 4.0, 1.0, 3.0]
         self.assertListEqual(expected, to_test)
 
     def test_plot_integers_with_gaps(self):
         fig = Figure(size=(500, 300))
         fig.plot([2, 3, 6], [1, 2, 10], color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [18.0, 42.0]
+        expected = [2.0, 6.0, 1, 10]
         self.assertListEqual(expected, to_test)
 
     def test_plot_large_integers_list(self):
         fig = Figure(size=(500, 300))
         fig.plot(list([i for i in range(1, 50000)]), list([i for i in range(1, 50000)]), color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [0.144, 0.0756]
+        expected = [0, 50000, 0, 50000]
         self.assertListEqual(expected, to_test)
 
     def test_plot_floats_without_gaps(self):
         fig = Figure(size=(500, 300))
         fig.plot([0.1, 0.2, 0.3], [0.7, 0.8, 0.9], color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [360.0, 15.75]
+        expected = [0.1, 0.3, 0.68, 0.92]
         self.assertListEqual(expected, to_test)
 
     def test_plot_floats_with_gaps(self):
         fig = Figure(size=(500, 300))
         fig.plot([0.1, 0.2, 3.5], [0.7, 1.8, 2.4], color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [20.0, 21.0]
+        expected = [0.0, 3.6, 0.6, 2.4]
         self.assertListEqual(expected, to_test)
 
     def test_plot_small_floats_small_list(self):
         fig = Figure(size=(500, 300))
         fig.plot([0.000001, 0.000002], [0.000007, 0.000008], color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [720.0, 378.0]
+        expected = [0.000001, 0.000002, 0.000007, 0.000008]
         self.assertListEqual(expected, to_test)
 
     def test_plot_small_floats_large_list(self):
         fig = Figure(size=(500, 300))
         fig.plot([0.000001, 1], [0.000007, 1], color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [72.0, 37.8]
+        expected = [0.0, 1.0, 0.0, 1.0]
         self.assertListEqual(expected, to_test)
 
     def test_multiple_plots(self):
         fig = Figure(size=(500, 300))
         fig.plot([1, 2, 3], [1, 2, 3], color='red', linewidth=7)
         fig.plot([4, 5, 6], [4, 5, 6], color='blue', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [144.0, 75.6]
+        expected = [1.0, 6.0, 1.0, 6.0]
         self.assertListEqual(expected, to_test)
 
     def test_single_point_plot(self):
         fig = Figure(size=(500, 300))
         fig.plot([1], [3], color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [720.0, 378.0]
+        expected = [1, 1, 3, 3]
         self.assertListEqual(expected, to_test)
 
     def test_plot_dates_without_gaps(self):
@@ -112,10 +131,14 @@ class TestFigure(unittest.TestCase):
 
         fig = Figure(size=(500, 300))
         fig.plot(times, y, color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [8.0, 11.8125]
+        expected = [
+            np.datetime64('2022-01-01'), np.datetime64('2022-04-01'), 0.0, 3.2
+        ]
         self.assertListEqual(expected, to_test)
 
     def test_plot_dates_with_gaps(self):
@@ -134,10 +157,14 @@ class TestFigure(unittest.TestCase):
 
         fig = Figure(size=(500, 300))
         fig.plot(times, y, color='red', linewidth=7)
-        to_test = [fig.grid.cell_width, fig.grid.cell_height]
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [3.0, 11.8125]
+        expected = [
+            np.datetime64('2022-01-01'), np.datetime64('2022-08-29'), 0, 32
+        ]
         self.assertListEqual(expected, to_test)
 
     def test_plot_dates_with_year_locator(self):
@@ -152,10 +179,15 @@ class TestFigure(unittest.TestCase):
         fig.set_major_locator(locator, axis='x')
 
         fig.plot(times, y, color='red', linewidth=7)
-        to_test = [round(fig.grid.cell_width, 2), fig.grid.cell_height]
+
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [0.28, 54.0]
+        expected = [
+            np.datetime64('2022-01-01'), np.datetime64('2029-01-01'), 0, 7
+        ]
         self.assertListEqual(expected, to_test)
 
     def test_plot_dates_with_month_locator(self):
@@ -170,10 +202,15 @@ class TestFigure(unittest.TestCase):
         fig.set_major_locator(locator, axis='x')
 
         fig.plot(times, y, color='red', linewidth=7)
-        to_test = [round(fig.grid.cell_width, 2), fig.grid.cell_height]
+
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [2.37, 37.8]
+        expected = [
+            np.datetime64('2022-01-01'), np.datetime64('2022-11-01'), 0, 10
+        ]
         self.assertListEqual(expected, to_test)
 
     def test_plot_dates_with_day_locator(self):
@@ -188,10 +225,15 @@ class TestFigure(unittest.TestCase):
         fig.set_major_locator(locator, axis='x')
 
         fig.plot(times, y, color='red', linewidth=7)
-        to_test = [round(fig.grid.cell_width, 2), fig.grid.cell_height]
+
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [1.3, 15.75]
+        expected = [
+            np.datetime64('2022-01-01'), np.datetime64('2022-01-24'), 0, 24
+        ]
         self.assertListEqual(expected, to_test)
 
     def test_plot_dates_with_hour_locator(self):
@@ -209,10 +251,15 @@ class TestFigure(unittest.TestCase):
         fig.set_major_formatter(formatter, axis='x')
 
         fig.plot(times, y, color='red', linewidth=7)
-        to_test = [round(fig.grid.cell_width, 2), fig.grid.cell_height]
+
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [0.92, 27.0]
+        expected = [
+            np.datetime64('2022-01-01T01'), np.datetime64('2022-01-01T14'), 0, 14
+        ]
         self.assertListEqual(expected, to_test)
 
     def test_plot_dates_with_minute_locator(self):
@@ -230,10 +277,15 @@ class TestFigure(unittest.TestCase):
         fig.set_major_formatter(formatter, axis='x')
 
         fig.plot(times, y, color='red', linewidth=7)
-        to_test = [round(fig.grid.cell_width, 2), fig.grid.cell_height]
+
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
         fig.close()
 
-        expected = [1.5, 47.25]
+        expected = [
+            np.datetime64('2022-01-01T01:01'), np.datetime64('2022-01-01T01:09'), 0, 8
+        ]
         self.assertListEqual(expected, to_test)
 
     def test_plot_dates_with_second_locator(self):
@@ -251,12 +303,80 @@ class TestFigure(unittest.TestCase):
         fig.set_major_formatter(formatter, axis='x')
 
         fig.plot(times, y, color='red', linewidth=7)
-        to_test = [round(fig.grid.cell_width, 2), fig.grid.cell_height]
+
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax,
+                   fig.grid.y_scale.vmin, fig.grid.y_scale.vmax]
+        fig.close()
+
+        expected = [
+            np.datetime64('2022-01-01T01:01:01'), np.datetime64('2022-01-01T01:01:16'), 0, 16
+        ]
+        self.assertListEqual(expected, to_test)
+
+    def test_plot_dates_with_seconds_over_years(self):
+        times = np.arange(np.datetime64('2012-01-01'), np.datetime64('2022-01-01'),
+                          np.timedelta64(1, 'D')).astype('datetime64[s]')
+        times[1] += np.timedelta64(17, 's')
+        y = list(range(len(times)))
+
+        fig = Figure(size=(500, 300))
+        fig.plot(times, y, color='red', linewidth=7)
+        fig.to_array()
+        to_test = [fig.grid.x_scale.vmin, fig.grid.x_scale.vmax]
         fig.close()
 
-        expected = [48.0, 23.625]
+        expected = [np.datetime64('2012-01-01'), np.datetime64('2021-12-31')]
         self.assertListEqual(expected, to_test)
 
+    def test_plot_dates_nanoseconds(self):
+        dmin = np.datetime64('2022-01-01 01:01:01', 'ns')
+        times = dmin + np.arange(0, 50000, 100).astype('timedelta64[ms]')
+        y = list(range(len(times)))
+
+        fig = Figure(size=(500, 300))
+        fig.plot(times, y, color='red', linewidth=7)
+        to_test = fig.to_array()
+        coords = fig.grid.get_axes_points_coords(fig.axes[0])
+        fig.close()
+
+        with self.subTest():
+            self.assertEqual(fig.axes[0].xvalues.dtype, np.dtype('datetime64[ns]'))
+
+        with self.subTest():
+            self.assertTrue(np.all(np.diff(coords[:, 0]) > 0))
+
+        with self.subTest():
+            self.assertTupleEqual(to_test.shape, (300, 500, 3))
+
+    def test_plot_markers(self):
+        fig = Figure(size=(500, 300))
+        fig.plot([1, 2, 3], [1, 2, 3], marker='o')
+        fig.plot([1, 2, 3], [2, 3, 1], marker='s')
+        fig.plot([1, 2, 3], [3, 1, 2], marker='^', linestyle=None)
+        fig.plot([1, 2, 3], [1, 3, 2], marker='x', linestyle=None)
+        to_test = fig.to_array()
+        fig.close()
+
+        self.assertTupleEqual(to_test.shape, (300, 500, 3))
+
+    def test_plot_without_supersampling(self):
+        fig = Figure(size=(500, 300), supersample=False)
+        fig.plot([1, 2, 3], [1, 2, 3], color='red', linewidth=7, marker='o')
+        fig.title('Test')
+        fig.legend()
+        to_test = fig.to_array()
+
+        with self.subTest():
+            self.assertTupleEqual(fig.img.size, (500, 300))
+
+        with self.subTest():
+            self.assertTupleEqual(to_test.shape, (300, 500, 3))
+
+        with self.subTest():
+            self.assertTrue(fig.draw.antialias)
+        fig.close()
+
     def test_save(self):
         fig = Figure(size=(500, 300))
         fig.plot([1, 2, 3], [1, 2, 3], color='red', linewidth=7)
@@ -267,6 +387,87 @@ class TestFigure(unittest.TestCase):
             self.assertTrue('graph.png' in os.listdir(here))
         os.remove(os.path.join(here, 'graph.png'))
 
+    def test_plot_is_deferred(self):
+        fig = Figure(size=(500, 300))
+        fig.plot([1, 2, 3], [1, 2, 3], color='red', linewidth=7)
+        fig.plot([1, 2, 3], [3, 2, 1], color='blue', linewidth=7)
+        fig.title('Test')
+        fig.legend()
+
+        with self.subTest():
+            self.assertIsNone(fig.img)
+
+        to_test = fig.to_array()
+        fig.close()
+
+        with self.subTest():
+            self.assertTupleEqual(to_test.shape, (300, 500, 3))
+
+    def test_locator_set_after_plot(self):
+        fig = Figure(size=(500, 300))
+        fig.plot(list(range(41)), list(range(41)), color='red', linewidth=7)
+        fig.set_major_locator(AutoLocator(nbins=2), axis='x')
+        fig.set_major_formatter(AutoFormatter(), axis='y')
+        fig.to_array()
+        fig.close()
+
+        with self.subTest():
+            self.assertListEqual(fig.grid.x_scale.major_ticks.tolist(), [0, 20, 40])
+
+        with self.subTest():
+            self.assertIsInstance(fig.y_formatter, AutoFormatter)
+
+    def test_render_is_reused(self):
+        fig = Figure(size=(500, 300))
+        fig.plot([1, 2, 3], [1, 2, 3], color='red', linewidth=7)
+        fig.to_array()
+        img = fig.img
+
+        with self.subTest():
+            fig.to_array()
+            self.assertIs(img, fig.img)
+
+        with self.subTest():
+            fig.title('Test')
+            fig.to_array()
+            self.assertIsNot(img, fig.img)
+
+        fig.close()
+
+    def test_plot_shares_arrays(self):
+        xvalues, yvalues = np.arange(100), np.linspace(-1, 1, 101)[1:].round(2)
+        yvalues.flags.writeable = False
+
+        fig = Figure(size=(500, 300))
+        fig.plot(xvalues, yvalues)
+        fig.plot(xvalues, yvalues, copy=True)
+        to_test = fig.to_array()
+        fig.close()
+
+        with self.subTest():
+            self.assertTrue(np.shares_memory(fig.axes[0].xvalues, xvalues))
+            self.assertTrue(np.shares_memory(fig.axes[0].yvalues, yvalues))
+
+        with self.subTest():
+            self.assertFalse(np.shares_memory(fig.axes[1].xvalues, xvalues))
+            self.assertFalse(np.shares_memory(fig.axes[1].yvalues, yvalues))
+
+        with self.subTest():
+            self.assertTupleEqual(to_test.shape, (300, 500, 3))
+
+    def test_plot_epoch_values(self):
+        dates = np.arange('2022-01-01', '2022-01-11', dtype='datetime64[D]')
+        images = list()
+
+        for xvalues, xunit in [(dates.astype('datetime64[s]'), None),
+                               (dates.astype('datetime64[s]').astype(np.int64), 's')]:
+            fig = Figure(size=(500, 300))
+            fig.plot(xvalues, np.arange(10), xunit=xunit)
+            images.append(fig.to_array())
+            fig.close()
+
+        self.assertTrue(np.array_equal(images[0], images[1]))
+
     @unittest.skipIf(platform.platform().startswith('Windows'), reason='No need')
     def test_show(self):
         # Not a real test
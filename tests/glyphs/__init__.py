@@ -0,0 +1 @@
+from .test_glyphs import TestGlyphs
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+from simpleplots.glyphs import GlyphAtlas, get_glyph_atlas
+from simpleplots.visuals import LABEL_CACHE, CustomImageDraw
+from simpleplots.themes import StandardTheme
+from simpleplots.utils import get_font
+from simpleplots import Figure
+from datetime import datetime, timedelta
+from PIL import Image
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------
+
+class TestGlyphs(unittest.TestCase):
+
+    def setUp(self):
+        self.font = get_font('tick_label', StandardTheme, 1600)
+
+    def test_supports(self):
+        atlas = get_glyph_atlas(self.font)
+
+        with self.subTest():
+            self.assertTrue(atlas.supports('-12.5'))
+
+        with self.subTest():
+            self.assertTrue(atlas.supports('2022-01-01 12:30'))
+
+        with self.subTest():
+            self.assertFalse(atlas.supports('1e-05'))
+
+    def test_atlas_is_cached(self):
+        self.assertIs(get_glyph_atlas(self.font), get_glyph_atlas(self.font))
+
+    def test_draw_matches_text(self):
+        atlas = GlyphAtlas(self.font)
+
+        for label in ['-0.25', '10', '2022-01-01', '12:30']:
+            for xy in [(100, 50), (100.5, 50.5), (100.3, 50.7)]:
+                expected = Image.new('RGB', (300, 100), (255, 255, 255))
+                CustomImageDraw(expected).text(xy, label, font=self.font,
+                                               anchor='mm', fill=(0, 0, 0))
+
+                to_test = Image.new('RGB', (300, 100), (255, 255, 255))
+                atlas.draw(CustomImageDraw(to_test), xy, label, fill=(0, 0, 0))
+
+                with self.subTest(label=label, xy=xy):
+                    np.testing.assert_array_equal(np.asarray(to_test),
+                                                  np.asarray(expected))
+
+    def test_rotated_draw_is_cached(self):
+        atlas = GlyphAtlas(self.font)
+        images = list()
+        LABEL_CACHE.clear()
+
+        for _ in range(2):
+            image = Image.new('RGB', (300, 300), (255, 255, 255))
+            atlas.draw(CustomImageDraw(image), (150, 150), '2022-01-01',
+                       fill=(0, 0, 0), rotation=45)
+            images.append(np.asarray(image))
+
+        with self.subTest():
+            self.assertTupleEqual(LABEL_CACHE.info()[:2], (1, 1))
+
+        with self.subTest():
+            np.testing.assert_array_equal(*images)
+
+        with self.subTest():
+            self.assertTrue(np.any(images[0] == 0))
+
+    def test_figure_with_glyph_atlas(self):
+        xvalues = [datetime(2022, 1, 1) + timedelta(hours=i) for i in range(50)]
+
+        for backend in ['pil', 'numpy']:
+            arrays = list()
+            for glyph_atlas in [False, True]:
+                fig = Figure(size=(500, 300), backend=backend,
+                             glyph_atlas=glyph_atlas)
+                fig.plot(xvalues, [i * 0.37 for i in range(50)])
+                arrays.append(fig.to_array())
+                fig.close()
+
+            with self.subTest(backend=backend):
+                np.testing.assert_array_equal(*arrays)
+
+#-----------------------------------------------------------------------------
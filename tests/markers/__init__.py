@@ -0,0 +1 @@
+from .test_markers import TestMarkers
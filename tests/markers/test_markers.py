@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+from simpleplots.markers import MARKERS, get_marker_sprite, stamp_sprite
+import simpleplots.markers
+import tracemalloc
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------
+
+class TestMarkers(unittest.TestCase):
+
+    def test_sprite_is_cached(self):
+        sprite = get_marker_sprite('o', 4, 'red')
+
+        with self.subTest():
+            self.assertIs(sprite, get_marker_sprite('o', 4, 'red'))
+
+        with self.subTest():
+            self.assertTupleEqual(sprite.color, (255, 0, 0))
+
+        with self.subTest():
+            self.assertTupleEqual(sprite.alpha.shape, (9, 9))
+
+    def test_sprite_shapes(self):
+        for marker in MARKERS:
+            with self.subTest(marker=marker):
+                sprite = get_marker_sprite(marker, 3, (0, 0, 255))
+                self.assertEqual(sprite.alpha[3, 3], 1)
+
+    def test_antialiased_sprite(self):
+        sprite = get_marker_sprite('o', 4, 'red', antialias=True)
+
+        with self.subTest():
+            self.assertTupleEqual(sprite.alpha.shape, (9, 9))
+
+        with self.subTest():
+            self.assertEqual(sprite.alpha[4, 4], 1)
+
+        with self.subTest():
+            self.assertTrue(np.any((sprite.alpha > 0) & (sprite.alpha < 1)))
+
+    def test_unknown_marker(self):
+        with self.assertRaises(ValueError):
+            get_marker_sprite('?', 3, 'red')
+
+    def test_stamp_sprite(self):
+        sprite = get_marker_sprite('s', 1, (0, 0, 0))
+        points = np.asarray([[2.2, 2.0], [1.8, 2.1], [9.0, 9.0]])
+        coverage, xy = stamp_sprite(points, sprite)
+
+        with self.subTest():
+            self.assertTupleEqual(xy, (1, 1))
+
+        with self.subTest():
+            expected = np.zeros((10, 10), dtype=np.uint8)
+            expected[0:3, 0:3] = 255
+            expected[7:, 7:] = 255
+            self.assertListEqual(coverage.tolist(), expected.tolist())
+
+    def test_stamp_sprite_memory(self):
+        points = np.random.default_rng(0).uniform(0, 1000, (50000, 2))
+        sprite = get_marker_sprite('o', 10, 'red', antialias=True)
+
+        chunk_size = simpleplots.markers.STAMP_CHUNK_SIZE
+        try:
+            simpleplots.markers.STAMP_CHUNK_SIZE = 1 << 30
+            expected, offset = stamp_sprite(points, sprite)
+        finally:
+            simpleplots.markers.STAMP_CHUNK_SIZE = chunk_size
+
+        tracemalloc.start()
+        to_test, to_test_offset = stamp_sprite(points, sprite)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        with self.subTest():
+            self.assertTrue(np.array_equal(to_test, expected))
+            self.assertTupleEqual(to_test_offset, offset)
+
+        with self.subTest():
+            # coverage mask, unique points and a bounded number of indices
+            self.assertLess(peak, to_test.nbytes + points.size * 16 + chunk_size * 24)
+
+#-----------------------------------------------------------------------------
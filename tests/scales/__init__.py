@@ -0,0 +1 @@
+from .test_scales import TestScales
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from simpleplots.scales import LinearScale, DateScale
+import unittest
+import numpy as np
+import datetime
+
+#-----------------------------------------------------------------------------
+
+class TestScales(unittest.TestCase):
+
+    def test_linear_scale_limits(self):
+        values = np.asarray([0.15, 0.2, 3.5])
+        scale = LinearScale(values, [0.0, 1.0, 2.0, 3.0])
+        self.assertListEqual([scale.vmin, scale.vmax], [0.0, 3.5])
+
+    def test_linear_scale_integer_ticks(self):
+        values = np.asarray([1, 5, 17])
+        scale = LinearScale(values, np.asarray([0.0, 10.0, 20.0]))
+
+        with self.subTest():
+            self.assertEqual(scale.major_ticks.dtype, values.dtype)
+
+        with self.subTest():
+            scale = LinearScale(values, np.asarray([0.0, 2.5, 5.0]))
+            self.assertEqual(scale.major_ticks.dtype, np.float64)
+
+    def test_linear_scale_narrow_integers(self):
+        values = np.asarray([2 ** 31 - 1000, 2 ** 31 - 1], dtype=np.int32)
+        scale = LinearScale(values, np.asarray([2 ** 31 - 1000.0, 2 ** 31 + 1000.0]))
+
+        with self.subTest():
+            self.assertEqual(scale.major_ticks.dtype, np.int64)
+
+        with self.subTest():
+            self.assertListEqual([scale.vmin, scale.vmax], [2 ** 31 - 1000, 2 ** 31 + 1000])
+
+        with self.subTest():
+            numeric = scale.to_numeric(values)
+            self.assertEqual(numeric.dtype, np.int64)
+            self.assertEqual(scale.vmax - numeric[-1], 1001)
+
+    def test_linear_scale_single_value(self):
+        scale = LinearScale(np.asarray([3, 3]), [3])
+        self.assertTrue(scale.single)
+
+    def test_linear_scale_high_resolution_values(self):
+        values = np.linspace(0, 1000, 5000).round(4)
+        scale = LinearScale(values, np.arange(0, 1100, 100))
+        self.assertEqual(len(scale.major_ticks), 11)
+
+    def test_date_scale_limits(self):
+        values = np.asarray(['2022-03-05', '2025-07-01'], dtype='datetime64[s]')
+        ticks = [datetime.datetime(2022, 1, 1), datetime.datetime(2024, 1, 1),
+                 datetime.datetime(2026, 1, 1)]
+        scale = DateScale(values, ticks)
+
+        with self.subTest():
+            self.assertEqual(scale.major_ticks.dtype, values.dtype)
+
+        with self.subTest():
+            expected = [np.datetime64('2022-01-01'), np.datetime64('2026-01-01')]
+            self.assertListEqual([scale.vmin, scale.vmax], expected)
+
+    def test_date_scale_to_numeric(self):
+        values = np.asarray(['2022-01-01T00:00:00.000000001',
+                             '2022-01-01T00:00:01'], dtype='datetime64[ns]')
+        scale = DateScale(values, values)
+        to_test = scale.to_numeric(values)
+
+        with self.subTest():
+            self.assertTrue(np.shares_memory(to_test, values))
+
+        with self.subTest():
+            self.assertEqual(to_test[1] - to_test[0], 999999999)
+
+#-----------------------------------------------------------------------------
@@ -5,5 +5,12 @@ from .ticker import TestTicker
 from .visuals import TestVisuals
 from .figure import TestFigure
 from .dates import TestDates
+from .scales import TestScales
+from .markers import TestMarkers
+from .backends import TestBackends
+from .downsample import TestDownsample
+from .cache import TestCache
+from .glyphs import TestGlyphs
+from .base import TestBase
 
 #-----------------------------------------------------------------------------
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from simpleplots.ticker import AutoLocator, EdgeInteger, scale_range
+from simpleplots.ticker import (AutoLocator, AutoFormatter, EdgeInteger, scale_range,
+                               TICK_CACHE, TICK_LABEL_CACHE)
 import unittest
 import numpy as np
 
@@ -83,4 +84,102 @@ class TestTicker(unittest.TestCase):
         expected = np.asarray([0.0, 1.0, 2.0, 3.0])
         self.assertListEqual(ticks.tolist(), expected.tolist())
 
+    def test_autoformatter_format_ticks(self):
+        TICK_LABEL_CACHE.clear()
+        formatter = AutoFormatter()
+
+        with self.subTest():
+            to_test = formatter.format_ticks(np.asarray([0.1 + 0.2, 1.0, 1e-05]))
+            self.assertListEqual(to_test, ['0.30000000000000004', '1.0', '1e-05'])
+
+        with self.subTest():
+            to_test = formatter.format_ticks(np.asarray([1, 2]))
+            self.assertListEqual(to_test, ['1', '2'])
+
+        with self.subTest():
+            formatter.format_ticks(np.asarray([1.0, 3.0]))
+            self.assertEqual(TICK_LABEL_CACHE.info().hits, 1)
+
+    def test_subclass_labels_are_not_shared(self):
+
+        class PrefixFormatter(AutoFormatter):
+
+            def __init__(self, prefix):
+                self.prefix = prefix
+
+            def __call__(self, value):
+                return self.prefix + str(value)
+
+            def _format_ticks(self, values):
+                return [self(value) for value in values.tolist()]
+
+        TICK_LABEL_CACHE.clear()
+        values = np.asarray([1, 2])
+
+        with self.subTest():
+            to_test = PrefixFormatter('$').format_ticks(values)
+            self.assertListEqual(to_test, ['$1', '$2'])
+
+        with self.subTest():
+            to_test = PrefixFormatter('EUR ').format_ticks(values)
+            self.assertListEqual(to_test, ['EUR 1', 'EUR 2'])
+
+        with self.subTest():
+            self.assertEqual(len(TICK_LABEL_CACHE), 0)
+
+    def test_maxnlocator_floats_with_offset(self):
+        loc = AutoLocator()
+        ticks = loc.tick_values(98765.4, 98765.7)
+        expected = np.asarray([98765.4, 98765.44, 98765.48, 98765.52, 98765.56,
+                               98765.6, 98765.64, 98765.68, 98765.72])
+        self.assertListEqual(ticks.tolist(), expected.tolist())
+
+    def test_maxnlocator_tick_values_are_cached(self):
+        TICK_CACHE.clear()
+        ticks = AutoLocator().tick_values(0.1, 1.3)
+        ticks[0] = 100
+
+        with self.subTest():
+            to_test = AutoLocator().tick_values(0.1, 1.3)
+            self.assertListEqual(to_test.tolist(), [0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2, 1.4])
+
+        with self.subTest():
+            self.assertEqual(TICK_CACHE.info().hits, 1)
+
+        with self.subTest():
+            AutoLocator(nbins=5).tick_values(0.1, 1.3)
+            self.assertEqual(TICK_CACHE.info().misses, 2)
+
+    def test_maxnlocator_narrow_integers(self):
+        expected = AutoLocator().tick_values(np.int64(-100), np.int64(120)).tolist()
+
+        for dtype in [np.int8, np.int16, np.int64]:
+            TICK_CACHE.clear()
+
+            with self.subTest(dtype=dtype):
+                with np.errstate(over='raise'):
+                    to_test = AutoLocator().tick_values(dtype(-100), dtype(120))
+                self.assertListEqual(to_test.tolist(), expected)
+
+        with self.subTest():
+            # cached ticks of int8 limits are the ones computed in float
+            to_test = AutoLocator().tick_values(np.int8(-100), np.int8(120))
+            self.assertListEqual(to_test.tolist(), expected)
+
+    def test_maxnlocator_large_integers(self):
+        TICK_CACHE.clear()
+        vmin = np.int64(2 ** 60)
+
+        with self.subTest():
+            to_test = AutoLocator().tick_values(vmin, vmin + 100)
+            self.assertListEqual(list(to_test), [vmin])
+
+        with self.subTest():
+            to_test = AutoLocator().tick_values(vmin, vmin + 10 ** 6)
+            self.assertGreaterEqual(len(to_test), 2)
+
+        with self.subTest():
+            AutoLocator().tick_values(vmin, vmin + 10 ** 6 + 1)
+            self.assertEqual(TICK_CACHE.info().misses, 2)
+
 #-----------------------------------------------------------------------------
@@ -1,21 +1,203 @@
 # -*- coding: utf-8 -*-
 
-from simpleplots.utils import get_text_dimensions, smartrange, frange
+from simpleplots.utils import (get_text_dimensions, smartrange, frange, farange,
+                               get_font, load_font, measure_many, FONT_CACHE,
+                               TEXT_METRICS_CACHE, normalize_float,
+                               normalize_floats, decimals,
+                               find_min_timedelta, normalize_values,
+                               to_datetime64, find_gcd)
+from simpleplots.themes import StandardTheme
 import unittest
 import numpy as np
+import datetime
+import array
+import math
 
 #-----------------------------------------------------------------------------
 
 class TestUtils(unittest.TestCase):
 
     def test_get_text_dimensions(self):
-        pass
+        font = load_font('arial.ttf', 40)
+        descent = font.getmetrics()[1]
+        bbox = font.getmask('2000').getbbox()
+        TEXT_METRICS_CACHE.clear()
+
+        with self.subTest():
+            self.assertTupleEqual(get_text_dimensions('2000', font),
+                                  (bbox[2], bbox[3] + descent))
+
+        with self.subTest():
+            self.assertTupleEqual(get_text_dimensions('2000', font),
+                                  (bbox[2], bbox[3] + descent))
+
+        with self.subTest():
+            self.assertTupleEqual(TEXT_METRICS_CACHE.info()[:2], (1, 1))
+
+    def test_measure_many(self):
+        font = load_font('arial.ttf', 40)
+        labels = ['0', '2000', '4000', '2000']
+        to_test = measure_many(labels, font)
+
+        with self.subTest():
+            self.assertListEqual(to_test, [get_text_dimensions(l, font) for l in labels])
+
+        with self.subTest():
+            self.assertEqual(to_test[1], to_test[3])
+
+    def test_load_font_is_cached(self):
+        FONT_CACHE.clear()
+        font = load_font('arial.ttf', 20)
+
+        with self.subTest():
+            self.assertIs(font, load_font('arial.ttf', 20.7))
+
+        with self.subTest():
+            self.assertIsNot(font, load_font('arial.ttf', 21))
+
+        with self.subTest():
+            self.assertTupleEqual(FONT_CACHE.info()[:2], (1, 2))
+
+        with self.subTest():
+            self.assertIs(font, load_font(font.path, 20))
+
+    def test_get_font(self):
+        font = get_font('title', StandardTheme, 1000)
+
+        with self.subTest():
+            self.assertEqual(font.size, 33)
+
+        with self.subTest():
+            self.assertIs(font, get_font('title', StandardTheme, 1000))
+
+    def test_normalize_floats(self):
+        values = np.concatenate([
+            np.random.default_rng(0).normal(size=1000) * 10.0 ** np.arange(-10, 10).repeat(50),
+            [0.0, 1.230000000003, 0.1 + 0.2, 1234565.0, 0.1234565, 1.5e-05, 1e16]
+        ])
+
+        expected = [normalize_float(n) for n in values]
+        self.assertListEqual(normalize_floats(values).tolist(), expected)
+
+    def test_normalize_values_without_copy(self):
+        floats = np.linspace(0, 1, 11)[::2].round(1)
+        floats.flags.writeable = False
+        inputs = [
+            floats, np.arange(10), np.arange(10).astype('datetime64[s]'),
+            array.array('d', [0.5, 1.5]), memoryview(np.arange(10)),
+        ]
+
+        for values in inputs:
+            with self.subTest(values=values):
+                self.assertTrue(np.shares_memory(normalize_values(values), values))
+
+            with self.subTest(values=values):
+                to_test = normalize_values(values, copy=True)
+                self.assertFalse(np.shares_memory(to_test, values))
+                self.assertListEqual(to_test.tolist(), np.asarray(values).tolist())
+
+        with self.subTest():
+            values = np.asarray([0.1 + 0.2, 1.0])
+            to_test = normalize_values(values)
+            self.assertFalse(np.shares_memory(to_test, values))
+            self.assertListEqual(to_test.tolist(), [0.3, 1.0])
+
+    def test_to_datetime64(self):
+        values = [datetime.datetime(1969, 12, 31, 23, 59, 59, 500000),
+                  datetime.datetime(2022, 3, 4, 5, 6, 7), datetime.datetime(1, 1, 1)]
+
+        with self.subTest():
+            expected = np.asarray(values).astype('datetime64[s]').tolist()
+            self.assertListEqual(to_datetime64(values).tolist(), expected)
+
+        with self.subTest():
+            self.assertListEqual(normalize_values(values).tolist(), expected)
+
+        with self.subTest():
+            self.assertRaises(TypeError, normalize_values, [values[0], 1])
+
+    def test_normalize_values_epoch(self):
+        values = np.arange(3, dtype=np.int64) * 1000 + 1640995200000
+        to_test = normalize_values(values, unit='ms')
+
+        with self.subTest():
+            self.assertTrue(np.shares_memory(to_test, values))
+
+        with self.subTest():
+            self.assertEqual(to_test[1], np.datetime64('2022-01-01T00:00:01'))
+
+        with self.subTest():
+            self.assertRaises(ValueError, normalize_values, values, unit='h')
+
+        with self.subTest():
+            self.assertRaises(TypeError, normalize_values, values / 2, unit='s')
+
+        with self.subTest():
+            dates = [datetime.datetime(2022, 1, 1), datetime.datetime(2022, 1, 2)]
+            self.assertRaises(TypeError, normalize_values, dates, unit='ms')
+
+        with self.subTest():
+            dates = [datetime.datetime(2022, 1, 1), datetime.datetime(2022, 1, 2)]
+            self.assertRaises(ValueError, normalize_values, dates, unit='h')
+
+    def test_find_gcd(self):
+        values = np.random.default_rng(0).integers(-1000, 1000, 20000) * 6
+
+        with self.subTest():
+            self.assertEqual(find_gcd(values), 6)
+
+        with self.subTest():
+            self.assertEqual(find_gcd(np.append(values, 9)), 3)
+
+        with self.subTest():
+            self.assertEqual(find_gcd(np.append([7], values)), 1)
+
+        with self.subTest():
+            self.assertEqual(find_gcd([0, -4]), math.gcd(0, -4))
 
     def test_frange_without_step(self):
         to_test = list(frange(0.1, 0.6))
         expected = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6]
         self.assertListEqual(to_test, expected)
 
+    def test_farange(self):
+        with self.subTest():
+            to_test = farange(-0.5, 0.25, 0.25).tolist()
+            self.assertListEqual(to_test, [-0.5, -0.25, 0.0, 0.25])
+
+        with self.subTest():
+            to_test = farange(1, 2)
+            self.assertListEqual(to_test.tolist(), list(frange(1, 2)))
+
+        with self.subTest():
+            to_test = farange(0, 100, 0.0001)
+            self.assertListEqual([len(to_test), to_test[-1], to_test[12345]],
+                                 [1000001, 100.0, 1.2345])
+
+        with self.subTest():
+            to_test = farange(123456.7, 123457.5, 0.1).tolist()
+            self.assertListEqual([len(to_test), to_test[0], to_test[-1]],
+                                 [9, 123456.7, 123457.5])
+
+        with self.subTest():
+            to_test = farange(1000.1234, 1000.2, 0.0001).tolist()
+            self.assertListEqual([len(to_test), to_test[0], to_test[-1]],
+                                 [767, 1000.1234, 1000.2])
+
+    def test_find_min_timedelta(self):
+        start = np.datetime64('2022-01-10T22:00:00')
+        cases = [
+            (start + np.arange(30) * np.timedelta64(1, 'D'), np.timedelta64(1, 'D')),
+            (start + np.arange(3) * np.timedelta64(1, 'h'), np.timedelta64(1, 'h')),
+            (start + np.arange(3) * np.timedelta64(40, 'm'), np.timedelta64(1, 'm')),
+            (start + np.arange(3) * np.timedelta64(1, 'm'), np.timedelta64(1, 's')),
+            (start + np.arange(3) * np.timedelta64(1, 's'), None)
+        ]
+
+        for values, expected in cases:
+            with self.subTest(expected=expected):
+                self.assertEqual(find_min_timedelta(values), expected)
+
     def test_smartrange_floats_without_gaps(self):
         ov = np.asarray([0.1, 0.2])
         to_test = smartrange(0.1, 0.2, ov).tolist()
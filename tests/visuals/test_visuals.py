@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
-from simpleplots.visuals import Spines, PointsGrid
+from simpleplots.visuals import Spines, PointsGrid, Transform, CustomImageDraw, LABEL_CACHE
+from simpleplots.utils import load_font
 from simpleplots.base import Theme
+from PIL import Image
 import unittest
+import numpy as np
 
 class TestTheme(Theme):
     spine_box_width_perc = 0.8
@@ -30,4 +33,86 @@ class TestVisuals(unittest.TestCase):
         ]
         self.assertListEqual(to_test, expected)
 
+    def test_transform(self):
+        transform = Transform(origin=1, step=0.5, scale=10, offset=100)
+        to_test = transform(np.asarray([1, 1.5, 3]))
+
+        with self.subTest():
+            self.assertListEqual(to_test.tolist(), [100.0, 110.0, 140.0])
+
+        with self.subTest():
+            to_test = transform(np.asarray([1, 1.26]), dtype=np.int32)
+            self.assertEqual(to_test.dtype, np.int32)
+            self.assertListEqual(to_test.tolist(), [100, 105])
+
+    def test_transform_single_tick(self):
+        transform = Transform(origin=5, step=1, scale=0, offset=50)
+        to_test = transform(np.asarray([5, 5, 5]))
+        self.assertListEqual(to_test.tolist(), [50.0, 50.0, 50.0])
+
+    def test_transform_dates(self):
+        origin = np.datetime64('2022-01-01')
+        transform = Transform(origin, np.timedelta64(1, 'D'), 2, 0)
+        values = np.asarray(['2022-01-01', '2022-01-11'], dtype='datetime64[s]')
+        self.assertListEqual(transform(values).tolist(), [0.0, 20.0])
+
+    def test_legend_bbox_avoids_points(self):
+        # upper left section is crowded, the upper right one is next in order
+        crowded = np.asarray([[20.0, 20.0], [25.0, 25.0], [30.0, 15.0]])
+        section = self.grid.get_legend_bbox([], None, [crowded])
+
+        with self.subTest():
+            self.assertEqual(section['anchor'], 'ra')
+
+        with self.subTest():
+            self.assertEqual(section['hits'], 0)
+
+        # a point on an edge belongs to both of the adjacent sections
+        edge = np.asarray([[section['bbox'].x0, 20.0]])
+        section = self.grid.get_legend_bbox([], None, [crowded, edge])
+        self.assertEqual(section['anchor'], 'ld')
+
+    def test_rotated_labels_are_cached(self):
+        LABEL_CACHE.clear()
+        font = load_font('arial.ttf', 20)
+        images = list()
+
+        for _ in range(2):
+            image = Image.new('RGB', (100, 100), (255, 255, 255))
+            CustomImageDraw(image).rtext(xy=(50, 50), text='2022-01-01', font=font,
+                                         anchor='mm', fill=(0, 0, 0), rotation=45)
+            images.append(np.asarray(image))
+
+        with self.subTest():
+            self.assertTupleEqual(LABEL_CACHE.info()[:2], (1, 1))
+
+        with self.subTest():
+            self.assertTrue(np.array_equal(images[0], images[1]))
+
+        with self.subTest():
+            self.assertTrue(np.any(images[0] != 255))
+
+    def test_antialiased_rotated_labels(self):
+        LABEL_CACHE.clear()
+        font = load_font('arial.ttf', 14)
+        roughness = list()
+
+        for antialias in [False, True]:
+            image = Image.new('RGB', (200, 200), (255, 255, 255))
+            draw = CustomImageDraw(image)
+            draw.antialias = antialias
+            draw.rtext(xy=(150, 50), text='2022-01-01', font=font, anchor='mm',
+                       fill=(0, 0, 0), rotation=45)
+
+            gray = np.asarray(image.convert('L')).astype(np.int64)
+            edges = np.abs(np.diff(gray, axis=0)).sum() + np.abs(np.diff(gray, axis=1)).sum()
+            roughness.append(edges / (255 - gray).sum())
+
+        with self.subTest():
+            self.assertEqual(len(LABEL_CACHE), 2)
+
+        with self.subTest():
+            # smooth edges change less per unit of ink than jagged ones
+            self.assertLess(roughness[1], roughness[0] * 0.9)
+
 #-----------------------------------------------------------------------------